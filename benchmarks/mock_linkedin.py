@@ -0,0 +1,208 @@
+"""
+    Local LinkedIn stand-in serving synthetic pages that match the scraper's selectors
+
+    feed (global nav search) -> /search/results/all/ (Companies filter pill)
+    -> /search/results/companies/ (div[data-chameleon-result-urn] cards)
+    -> /company/<slug>/ (org-page-navigation__items) -> /company/<slug>/about/
+
+    python -m benchmarks.mock_linkedin --port 8765 --latency 0.2 --failure-rate 0.05
+"""
+import argparse
+import html
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+from .pages import about_page, company_profile, global_nav, navigation, slugify, top_card
+
+# names of other companies shown next to the searched one in the results list
+NEIGHBOURS = ["Holdings", "Group", "Technologies", "Foundation"]
+
+
+def page(title: str, body: str) -> str:
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+        '<style>#global-nav-search{width:320px;height:34px}'
+        '.search-global-typeahead__input{width:100%;height:100%;box-sizing:border-box}'
+        '.linked-area{display:block;padding:16px;cursor:pointer}</style></head>'
+        f'<body>{global_nav()}<main class="scaffold-layout__main">{body}</main></body></html>'
+    )
+
+
+def search_toolbar(keywords: str) -> str:
+    companies_url = f"/search/results/companies/?keywords={quote_plus(keywords)}"
+    pills = "".join(
+        f'<li class="search-reusables__primary-filter"><button aria-pressed="{str(label == "Companies").lower()}" '
+        f'class="artdeco-pill artdeco-pill--slate artdeco-pill--choice search-reusables__filter-pill-button" '
+        f'type="button" onclick="{"location.href=&quot;" + companies_url + "&quot;" if label == "Companies" else ""}">'
+        f'{label}</button></li>'
+        for label in ("People", "Posts", "Companies", "Jobs")
+    )
+    return f'<section class="scaffold-layout-toolbar"><ul role="list" class="search-reusables__filter-list">{pills}</ul></section>'
+
+
+def result_card(profile: dict) -> str:
+    urn = f"urn:li:company:{zlib.crc32(profile['slug'].encode())}"
+    url = f"/company/{profile['slug']}/"
+    return (
+        f'<li class="reusable-search__result-container"><div class="entity-result" data-chameleon-result-urn="{urn}">'
+        f'<div class="linked-area" onclick="location.href=\'{url}\'"><div class="entity-result__content">'
+        f'<span class="entity-result__title-text t-16"><a class="app-aware-link" data-test-app-aware-link href="{url}">'
+        f'{html.escape(profile["name"])}</a></span>'
+        f'<div class="entity-result__primary-subtitle t-14 t-black t-normal">{profile["industry"]} &bull; '
+        f'{profile["country"]}</div>'
+        f'<div class="entity-result__secondary-subtitle t-14 t-normal">{profile["followers"]}</div>'
+        f'</div></div></div></li>'
+    )
+
+
+class MockLinkedIn:
+    """
+        Threaded HTTP server for the scraper flow. `latency` (+ up to `jitter`)
+        seconds are added to every page, `failure_rate` of page requests get a
+        503 and `checkpoint_rate` are redirected to a checkpoint URL.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, checkpoint_rate: float = 0.0, filler_kb: int = 200, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.checkpoint_rate = checkpoint_rate
+        self.filler_kb = filler_kb
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.server = ThreadingHTTPServer((host, port), self.handler_class())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-linkedin", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def roll(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def render(self, path: str, query: dict):
+        """(status, html) for a path"""
+        parts = [part for part in path.split("/") if part]
+        keywords = query.get("keywords", [""])[0]
+
+        if not parts or parts[0] == "feed":
+            return 200, page("Feed | LinkedIn", '<div class="feed-container">Feed</div>')
+
+        if parts[:2] == ["search", "results"]:
+            body = search_toolbar(keywords)
+            if len(parts) > 2 and parts[2] == "companies":
+                profiles = [company_profile(keywords)] + [company_profile(f"{keywords} {suffix}")
+                                                          for suffix in NEIGHBOURS]
+                cards = "".join(result_card(profile) for profile in profiles)
+                body += f'<div class="search-results-container"><ul role="list">{cards}</ul></div>'
+            return 200, page(f"{keywords} | Search | LinkedIn", body)
+
+        if parts[0] == "checkpoint":
+            return 200, page("Security Verification | LinkedIn", "<h1>Let's do a quick security check</h1>")
+
+        if parts[0] == "company" and len(parts) >= 2:
+            slug = parts[1]
+            profile = company_profile(slug.replace("-", " ").title())
+            profile["slug"] = slug
+            if len(parts) > 2 and parts[2] == "about":
+                seed = zlib.crc32(slug.encode())
+                return 200, about_page(profile, filler_kb=self.filler_kb, seed=seed)
+            return 200, page(f"{profile['name']} | LinkedIn", top_card(profile) + navigation(slug, "Home"))
+
+        return 404, page("Page not found | LinkedIn", "<h1>Page not found</h1>")
+
+    def handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                url = urlsplit(self.path)
+                delay = server.latency + (server.roll() * server.jitter if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+
+                if url.path.startswith("/favicon"):
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                if server.failure_rate and server.roll() < server.failure_rate:
+                    server.failures += 1
+                    self.respond(503, page("Error | LinkedIn", "<h1>Service unavailable</h1>"))
+                    return
+                if server.checkpoint_rate and not url.path.startswith("/checkpoint") \
+                        and server.roll() < server.checkpoint_rate:
+                    server.failures += 1
+                    self.send_response(302)
+                    self.send_header("Location", "/checkpoint/challenge/")
+                    self.end_headers()
+                    return
+
+                status, body = server.render(url.path, parse_qs(url.query))
+                self.respond(status, body)
+
+            def respond(self, status, body):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every page")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per page")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of pages answered with 503")
+    parser.add_argument("--checkpoint-rate", type=float, default=0.0,
+                        help="fraction of pages redirected to a checkpoint")
+    parser.add_argument("--filler-kb", type=int, default=200, help="extra markup per About page")
+    args = parser.parse_args()
+
+    mock = MockLinkedIn(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                        failure_rate=args.failure_rate, checkpoint_rate=args.checkpoint_rate,
+                        filler_kb=args.filler_kb)
+    print(f"Serving LinkedIn stand-in on {mock.url} (SCRAPER_BASE_URL={mock.url})")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+    Synthetic LinkedIn-like pages matching the selectors the scraper relies on
+"""
+import html
+import random
+import re
+
+INDUSTRIES = ["Software Development", "Financial Services", "Retail", "Mining", "Hospital & Health Care",
+              "Renewable Energy", "Logistics", "Telecommunications"]
+COUNTRIES = ["EG", "KE", "MZ", "LS", "CD", "NG", "GH", "ZA"]
+SIZES = ["2-10 employees", "11-50 employees", "51-200 employees", "201-500 employees", "1,001-5,000 employees"]
+WORDS = ("platform customers africa growth data payments logistics retail health energy mobile service "
+         "technology market delivery finance solutions network partners team").split()
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def company_profile(name: str, seed=None) -> dict:
+    """Deterministic fake About data for a company name"""
+    rng = random.Random(seed if seed is not None else name)
+    return {
+        "name": name,
+        "slug": slugify(name),
+        "industry": rng.choice(INDUSTRIES),
+        "size": rng.choice(SIZES),
+        "founded": str(rng.randint(1990, 2023)),
+        "country": rng.choice(COUNTRIES),
+        "website": f"https://www.{slugify(name)}.example",
+        "phone": f"+{rng.randint(20, 299)} {rng.randint(100000000, 999999999)}",
+        "description": " ".join(sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(3, 8))),
+        "specialties": ", ".join(rng.sample(WORDS, 4)),
+        "followers": f"{rng.randint(100, 90000):,} followers",
+    }
+
+
+def filler(rng: random.Random, kilobytes: int) -> str:
+    """Feed cards, tracking markup and inline scripts padding a page to roughly `kilobytes`"""
+    parts, size = [], 0
+    while size < kilobytes * 1024:
+        block = (
+            f'<div class="artdeco-card feed-shared-update-v2 ember-view" id="ember{rng.randint(1000, 9999)}">'
+            f'<div class="update-components-actor__container display-flex"><span class="visually-hidden">'
+            f'{sentence(rng, 6)}</span></div><div class="update-components-text"><span dir="ltr">'
+            f'{sentence(rng, 40)}</span></div>'
+            f'<script type="application/json">{{"trackingId": "{rng.getrandbits(64):x}"}}</script></div>'
+        )
+        parts.append(block)
+        size += len(block)
+    return "".join(parts)
+
+
+def navigation(slug: str, active: str = "Home") -> str:
+    items = []
+    for label, path in (("Home", ""), ("About", "about/"), ("Posts", "posts/"), ("Jobs", "jobs/"),
+                        ("People", "people/")):
+        current = ' aria-current="page"' if label == active else ""
+        items.append(
+            f'<li class="org-page-navigation__item"><a class="org-page-navigation__item-anchor ember-view"'
+            f'{current} href="/company/{slug}/{path}">{label}</a></li>'
+        )
+    return f'<nav><ul class="org-page-navigation__items" role="list">{"".join(items)}</ul></nav>'
+
+
+def global_nav() -> str:
+    return (
+        '<header class="global-nav"><div id="global-nav-search" class="global-nav__search">'
+        '<form action="/search/results/all/" method="get">'
+        '<input class="search-global-typeahead__input" name="keywords" placeholder="Search" '
+        'aria-label="Search" autocomplete="off"></form></div></header>'
+    )
+
+
+def top_card(profile: dict) -> str:
+    return (
+        f'<section class="org-top-card"><h1 class="org-top-card-summary__title" title="{html.escape(profile["name"])}">'
+        f'{html.escape(profile["name"])}</h1><div class="org-top-card-summary-info-list">'
+        f'<div class="org-top-card-summary-info-list__info-item">{profile["industry"]}</div>'
+        f'<div class="org-top-card-summary-info-list__info-item">{profile["followers"]}</div></div></section>'
+    )
+
+
+def about_page(profile: dict, filler_kb: int = 0, seed: int = 0) -> str:
+    """A company About page with the Overview module and a Locations block"""
+    rng = random.Random(seed)
+    details = [
+        ("Website", f'<a href="{profile["website"]}" rel="noopener">{profile["website"]}</a>'),
+        ("Phone", f'<a href="tel:{profile["phone"]}"><span>{profile["phone"]}</span></a>'),
+        ("Industry", profile["industry"]),
+        ("Company size", profile["size"]),
+        ("Founded", profile["founded"]),
+        ("Specialties", profile["specialties"]),
+    ]
+    definitions = "".join(
+        f'<dt class="mb1"><h3 class="text-heading-medium">{key}</h3></dt>'
+        f'<dd class="mb4 t-black--light text-body-medium">{value}</dd>'
+        for key, value in details
+    )
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><title>{html.escape(profile["name"])} | About | LinkedIn</title>'
+        f'</head><body>{global_nav()}<main class="scaffold-layout__main">{top_card(profile)}'
+        f'{navigation(profile["slug"], "About")}'
+        f'<section class="artdeco-card org-page-details-module__card-spacing org-about-module__margin-bottom">'
+        f'<h2 class="text-heading-xlarge">Overview</h2>'
+        f'<p class="break-words white-space-pre-wrap t-black--light text-body-medium">'
+        f'{html.escape(profile["description"])}</p>'
+        f'<dl class="overflow-hidden">{definitions}</dl></section>'
+        f'<div class="org-locations-module"><h3 class="text-heading-xlarge">Locations (1)</h3>'
+        f'<div class="org-location-card pv2"><p class="t-14 t-black--light t-normal break-words">'
+        f'12 Main Road, Suite 4, {profile["country"]}</p></div></div>'
+        f'<aside class="scaffold-layout__aside">{filler(rng, filler_kb)}</aside>'
+        f'</main></body></html>'
+    )
+
+
+def corpus(count: int, filler_kb: int = 0):
+    """`count` About pages for made-up companies, each padded with `filler_kb` of extra markup"""
+    return [
+        about_page(company_profile(f"Company {index}"), filler_kb=filler_kb, seed=index)
+        for index in range(count)
+    ]
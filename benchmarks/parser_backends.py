@@ -0,0 +1,66 @@
+"""
+    Pages/second of CompanyAboutScraper for each parser backend, full vs scoped parsing
+
+    python -m benchmarks.parser_backends [--pages DIR] [--count 50] [--filler-kb 500]
+"""
+import argparse
+import importlib.util
+import logging
+import time
+from pathlib import Path
+
+from scraper.actions.scrape import CompanyAboutScraper
+from .pages import corpus
+
+logger = logging.getLogger("benchmarks")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+def available_backends():
+    backends = ["html.parser"]
+    if importlib.util.find_spec("lxml"):
+        backends.append("lxml")
+    return backends
+
+
+def load_pages(directory):
+    """Saved About pages (*.html) from a directory"""
+    return [path.read_text(encoding="utf-8", errors="ignore") for path in sorted(Path(directory).glob("*.html"))]
+
+
+def pages_per_second(pages, parser, scoped, rounds=3):
+    """Best of `rounds` passes of construction + extraction over every page"""
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for page in pages:
+            CompanyAboutScraper(page, "https://www.linkedin.com/company/bench/about/", logger,
+                                parser=parser, scoped=scoped).extract()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return len(pages) / best if best else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="directory of saved About page HTML files")
+    parser.add_argument("--count", type=int, default=50, help="synthetic pages when --pages is not given")
+    parser.add_argument("--filler-kb", type=int, default=500, help="extra markup per synthetic page")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages) if args.pages else corpus(args.count, filler_kb=args.filler_kb)
+    if not pages:
+        raise SystemExit(f"No *.html pages found in {args.pages}")
+    average_kb = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {average_kb:.0f} KB average")
+    print(f"{'backend':<14}{'scope':<8}{'pages/s':>10}")
+    for backend in available_backends():
+        for scoped in (False, True):
+            rate = pages_per_second(pages, backend, scoped, rounds=args.rounds)
+            print(f"{backend:<14}{'about' if scoped else 'full':<8}{rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
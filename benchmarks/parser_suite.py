@@ -0,0 +1,147 @@
+"""
+    CPU time and peak memory of CompanyAboutScraper per page, per step
+
+    python -m benchmarks.parser_suite [--corpus DIR] [--sizes 0,200,1000,4000] [--out results.json]
+    python -m benchmarks.parser_suite --compare before.json after.json
+
+    Pages: saved About pages from --corpus, synthetic About pages padded to
+    each --sizes (KB) and the repo's elemets.html. Construction and every
+    extract_* method are timed separately (median of --repeat runs) and the
+    tracemalloc peak of construction + extraction is recorded.
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import logging
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import bs4
+
+from scraper.actions.scrape import CompanyAboutScraper
+from .pages import about_page, company_profile
+
+EXTRACTORS = ("extract_company_name", "extract_company_website", "extract_overview_section",
+              "extract_locations_section")
+SOURCE_URL = "https://www.linkedin.com/company/bench/about/"
+
+logger = logging.getLogger("benchmarks")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+def load_pages(corpus, sizes):
+    """(label, html) pairs for every page in the suite"""
+    pages = []
+    if corpus:
+        for path in sorted(Path(corpus).glob("*.html")):
+            pages.append((f"corpus/{path.name}", path.read_text(encoding="utf-8", errors="ignore")))
+    for size in sizes:
+        pages.append((f"synthetic/{size}kb", about_page(company_profile("Bench Company"), filler_kb=size)))
+    elements = Path(__file__).resolve().parent.parent / "elemets.html"
+    if elements.exists():
+        pages.append(("elemets.html", elements.read_text(encoding="utf-8", errors="ignore")))
+    return pages
+
+
+def measure(page, parser, scoped, repeat):
+    """Median milliseconds for construction and each extractor, plus the tracemalloc peak"""
+    construct, extract = [], {name: [] for name in EXTRACTORS}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        scraper = CompanyAboutScraper(page, SOURCE_URL, logger, parser=parser, scoped=scoped)
+        construct.append(time.perf_counter() - started)
+        for name in EXTRACTORS:
+            started = time.perf_counter()
+            getattr(scraper, name)()
+            extract[name].append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        scraper = CompanyAboutScraper(page, SOURCE_URL, logger, parser=parser, scoped=scoped)
+        scraper.extract()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "construct_ms": statistics.median(construct) * 1000,
+        "extract_ms": {name: statistics.median(samples) * 1000 for name, samples in extract.items()},
+        "peak_kb": peak / 1024,
+    }
+
+
+def run_suite(pages, parsers, repeat):
+    results = []
+    for label, page in pages:
+        for parser in parsers:
+            for scoped in (False, True):
+                row = {"page": label, "bytes": len(page.encode("utf-8")), "parser": parser, "scoped": scoped}
+                row.update(measure(page, parser, scoped, repeat))
+                row["total_ms"] = row["construct_ms"] + sum(row["extract_ms"].values())
+                results.append(row)
+                print(f"{label:<28}{parser:<13}{'about' if scoped else 'full':<7}"
+                      f"{row['construct_ms']:>10.2f}{row['total_ms']:>10.2f}{row['peak_kb']:>11.0f}")
+    return results
+
+
+def compare(before_path, after_path):
+    """Print total time and peak memory ratios (after / before) for matching rows"""
+    with open(before_path, encoding="utf-8") as f:
+        before = {(r["page"], r["parser"], r["scoped"]): r for r in json.load(f)["results"]}
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)["results"]
+
+    print(f"{'page':<28}{'parser':<13}{'scope':<7}{'time x':>9}{'peak x':>9}")
+    for row in after:
+        old = before.get((row["page"], row["parser"], row["scoped"]))
+        if not old:
+            continue
+        time_ratio = row["total_ms"] / old["total_ms"] if old["total_ms"] else 0.0
+        peak_ratio = row["peak_kb"] / old["peak_kb"] if old["peak_kb"] else 0.0
+        print(f"{row['page']:<28}{row['parser']:<13}{'about' if row['scoped'] else 'full':<7}"
+              f"{time_ratio:>9.2f}{peak_ratio:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved About page HTML snapshots")
+    parser.add_argument("--sizes", default="0,200,1000,4000", help="synthetic page padding in KB, comma separated")
+    parser.add_argument("--parsers", help="comma separated tree builders (default: html.parser and lxml if installed)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default="parser_suite.json", help="machine-readable results file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    parsers = args.parsers.split(",") if args.parsers else \
+        ["html.parser"] + (["lxml"] if importlib.util.find_spec("lxml") else [])
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    pages = load_pages(args.corpus, sizes)
+
+    print(f"{'page':<28}{'parser':<13}{'scope':<7}{'build ms':>10}{'total ms':>10}{'peak KB':>11}")
+    results = run_suite(pages, parsers, args.repeat)
+    report = {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "beautifulsoup4": bs4.__version__,
+            "parsers": parsers,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+    End-to-end throughput of scraper.main.navigate() against the local LinkedIn stand-in
+
+    python -m benchmarks.throughput --companies 30 --workers 3 --latency 0.2 [--pacing] [--json out.json]
+
+    Runs in a scratch working directory so cookies, caches, job state and
+    results of the benchmark never touch the real ones under scraper/.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from .mock_linkedin import MockLinkedIn
+
+
+def prepare_workdir(count: int) -> Path:
+    workdir = Path(tempfile.mkdtemp(prefix="company-query-bench-"))
+    (workdir / "scraper").mkdir()
+    cookies = [{"name": "li_at", "value": "benchmark", "domain": "127.0.0.1", "path": "/"}]
+    (workdir / "scraper" / "cookies.json").write_text(json.dumps(cookies))
+    companies = [{"name": f"Bench Company {index}", "location": "Nigeria"} for index in range(count)]
+    (workdir / "scraper" / "companies.json").write_text(json.dumps(companies))
+    return workdir
+
+
+def print_report(report: dict):
+    print(f"{report['companies']} companies, {report['done']} done, {report['failed']} failed "
+          f"in {report['seconds']:.1f}s -> {report['companies_per_minute']:.1f} companies/minute")
+    print(f"{'step':<16}{'count':>7}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}")
+    for step, row in report["steps"].items():
+        print(f"{step:<16}{row['count']:>7}{row['p50']:>9.2f}{row['p95']:>9.2f}{row['p99']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds added to every mock page")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--checkpoint-rate", type=float, default=0.0)
+    parser.add_argument("--filler-kb", type=int, default=200)
+    parser.add_argument("--pacing", action="store_true", help="keep the human-like waits (off by default)")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    json_path = Path(args.json).resolve() if args.json else None
+    workdir = prepare_workdir(args.companies)
+    with MockLinkedIn(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                      checkpoint_rate=args.checkpoint_rate, filler_kb=args.filler_kb) as mock:
+        os.environ["SCRAPER_BASE_URL"] = mock.url
+        os.environ["SCRAPER_HEADLESS"] = "false" if args.headed else "true"
+        os.chdir(workdir)
+
+        # imported only now: module level paths and settings are resolved at import time
+        from scraper import main as scraper_main
+        from scraper.pacing import ACTION_PROFILES
+        from scraper.timing import step_timer
+
+        if not args.pacing:
+            # in place: every session's pacer reads the shared profiles
+            ACTION_PROFILES.update({action: ((0, 0, 0), 0) for action in ACTION_PROFILES})
+
+        started = time.perf_counter()
+        stats = asyncio.run(scraper_main.navigate(companies_file=workdir / "scraper" / "companies.json",
+                                                  workers=args.workers))
+        seconds = time.perf_counter() - started
+
+    done = sum(worker.done for worker in stats or [])
+    report = {
+        "companies": args.companies,
+        "workers": args.workers,
+        "done": done,
+        "failed": sum(worker.failed for worker in stats or []),
+        "seconds": seconds,
+        "companies_per_minute": done / seconds * 60 if seconds else 0.0,
+        "mock_requests": mock.requests,
+        "mock_failures": mock.failures,
+        "steps": step_timer.summary(),
+        "workdir": str(workdir),
+    }
+    print_report(report)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+    Run settings for the scraper, overridable through environment variables (or .env)
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# number of pages scraping companies side by side
+WORKERS = int(os.getenv("SCRAPER_WORKERS", "3"))
+
+# default per-action timeout (ms) for every page opened by the scraper
+PAGE_TIMEOUT = int(os.getenv("SCRAPER_PAGE_TIMEOUT", "15000"))
+
+# site root, pointed at benchmarks.mock_linkedin for local runs
+BASE_URL = os.getenv("SCRAPER_BASE_URL", "https://www.linkedin.com").rstrip("/")
+
+HEADLESS = os.getenv("SCRAPER_HEADLESS", "false").lower() in ("1", "true", "yes")
+
+# how long a company name -> company URL resolution is trusted before searching again
+RESOLUTION_TTL_DAYS = float(os.getenv("SCRAPER_RESOLUTION_TTL_DAYS", "30"))
+# new resolutions are written to scraper/resolution_cache.json at most this often (and at the end of the run)
+RESOLUTION_SAVE_INTERVAL = float(os.getenv("SCRAPER_RESOLUTION_SAVE_INTERVAL", "30"))
+
+# processes parsing About pages off the event loop (0 parses inline) and how many
+# captured pages may wait for them before the browser side is held back
+PARSE_PROCESSES = int(os.getenv("SCRAPER_PARSE_PROCESSES", "2"))
+PARSE_QUEUE_SIZE = int(os.getenv("SCRAPER_PARSE_QUEUE_SIZE", "8"))
+
+# results are buffered and appended to scraper/results/companies_about.jsonl in batches
+RESULTS_BATCH_SIZE = int(os.getenv("SCRAPER_RESULTS_BATCH_SIZE", "25"))
+RESULTS_FLUSH_INTERVAL = float(os.getenv("SCRAPER_RESULTS_FLUSH_INTERVAL", "10"))
+
+# abort requests for resource types the scraper never reads (plus known tracking/ad URLs)
+BLOCK_RESOURCES = os.getenv("SCRAPER_BLOCK_RESOURCES", "true").lower() in ("1", "true", "yes")
+BLOCKED_RESOURCE_TYPES = tuple(
+    t.strip() for t in os.getenv("SCRAPER_BLOCKED_RESOURCE_TYPES", "image,media,font").split(",") if t.strip()
+)
+# whitespace separated regexes replacing the built-in tracking URL block list and the login/captcha
+# allow-list of scraper/network.py; unset keeps the built-in list, an empty value clears it
+BLOCKED_URL_PATTERNS = (tuple(os.environ["SCRAPER_BLOCKED_URL_PATTERNS"].split())
+                        if "SCRAPER_BLOCKED_URL_PATTERNS" in os.environ else None)
+ALLOWED_URL_PATTERNS = (tuple(os.environ["SCRAPER_ALLOWED_URL_PATTERNS"].split())
+                        if "SCRAPER_ALLOWED_URL_PATTERNS" in os.environ else None)
+
+# page-loading actions allowed per minute per account, with short bursts
+PACE_RATE_PER_MINUTE = float(os.getenv("SCRAPER_PACE_RATE_PER_MINUTE", "20"))
+PACE_BURST = int(os.getenv("SCRAPER_PACE_BURST", "4"))
+
+# Prometheus metrics: served on http://127.0.0.1:<port>/metrics while running (0 disables)
+# and written to the textfile at the end of every run ("" disables)
+METRICS_PORT = int(os.getenv("SCRAPER_METRICS_PORT", "0"))
+METRICS_TEXTFILE = os.getenv("SCRAPER_METRICS_TEXTFILE", "scraper/results/metrics.prom")
+
+# scraper log, written by one background thread per process and rotated by size
+# (or by time when SCRAPER_LOG_ROTATE_WHEN is e.g. "midnight")
+LOG_FILE = os.getenv("SCRAPER_LOG_FILE", "scraper/scraper.log")
+LOG_MAX_BYTES = int(os.getenv("SCRAPER_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("SCRAPER_LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_WHEN = os.getenv("SCRAPER_LOG_ROTATE_WHEN", "")
+# repetitive fallback lines are logged once, then one in this many
+LOG_SAMPLE_EVERY = int(os.getenv("SCRAPER_LOG_SAMPLE_EVERY", "20"))
+
+# accounts to spread the work over: a JSON list of {"name", "username", "password", "cookies"};
+# without the file the USERNAME/PASSWORD account and scraper/cookies.json are used
+ACCOUNTS_FILE = os.getenv("SCRAPER_ACCOUNTS_FILE", "scraper/accounts.json")
+# pages open at once per account (0: up to SCRAPER_WORKERS) and how long an account
+# redirected to a checkpoint gets no work
+SESSION_MAX_PAGES = int(os.getenv("SCRAPER_SESSION_MAX_PAGES", "0"))
+SESSION_BENCH_MINUTES = float(os.getenv("SCRAPER_SESSION_BENCH_MINUTES", "30"))
+
+# scraper.daemon: local socket (TCP port where unix sockets are unavailable) and the
+# largest request/response line in bytes
+DAEMON_SOCKET = os.getenv("SCRAPER_DAEMON_SOCKET", "scraper/daemon.sock")
+DAEMON_PORT = int(os.getenv("SCRAPER_DAEMON_PORT", "8766"))
+DAEMON_MAX_REQUEST = int(os.getenv("SCRAPER_DAEMON_MAX_REQUEST", str(16 * 1024 * 1024)))
+
+# also scrape every company's Posts feed (--posts), at most this many new posts per company
+SCRAPE_POSTS = os.getenv("SCRAPER_POSTS", "false").lower() in ("1", "true", "yes")
+POSTS_MAX = int(os.getenv("SCRAPER_POSTS_MAX", "200"))
+# deadline (seconds) for one company's Posts feed, run after (and outside) the company deadline
+POSTS_TIMEOUT = float(os.getenv("SCRAPER_POSTS_TIMEOUT", "600"))
+
+# skip parsing and writing About pages whose content fingerprint matches the last run
+CHANGE_DETECTION = os.getenv("SCRAPER_CHANGE_DETECTION", "true").lower() in ("1", "true", "yes")
+
+# query engine (root main.py): persisted indexes over the results and the local HTTP API port
+QUERY_INDEX = os.getenv("SCRAPER_QUERY_INDEX", "scraper/results/companies.index")
+QUERY_PORT = int(os.getenv("SCRAPER_QUERY_PORT", "8767"))
+
+# deadlines (seconds) for one step of a company (search, fingerprint, capture, ...) and
+# for the whole company; a failed or timed out step is retried this many times with
+# exponential backoff and jitter between attempts
+STEP_TIMEOUT = float(os.getenv("SCRAPER_STEP_TIMEOUT", "90"))
+COMPANY_TIMEOUT = float(os.getenv("SCRAPER_COMPANY_TIMEOUT", "300"))
+STEP_RETRIES = int(os.getenv("SCRAPER_STEP_RETRIES", "1"))
+RETRY_BASE_SECONDS = float(os.getenv("SCRAPER_RETRY_BASE_SECONDS", "2"))
+RETRY_MAX_SECONDS = float(os.getenv("SCRAPER_RETRY_MAX_SECONDS", "30"))
+# a worker pauses after this many failed companies in a row (0 never pauses)
+BREAKER_FAILURES = int(os.getenv("SCRAPER_BREAKER_FAILURES", "3"))
+BREAKER_PAUSE_SECONDS = float(os.getenv("SCRAPER_BREAKER_PAUSE_SECONDS", "120"))
+# passes over the companies that failed, once the rest of the run is done
+DEFERRED_ROUNDS = int(os.getenv("SCRAPER_DEFERRED_ROUNDS", "1"))
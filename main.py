@@ -0,0 +1,102 @@
+"""
+    Query the scraped companies
+
+    python main.py query [--industry ...] [--country ...] [--size 11-50] [--founded-from 2000] [--founded-to 2010] [--text "cloud security"]
+    python main.py serve [--port 8767]     # GET /companies?industry=...&text=...&limit=20, GET /stats
+    python main.py build                   # rebuild the saved indexes
+
+    Indexes are kept in scraper/results/companies.index and rebuilt only when the results change.
+"""
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import config
+from scraper.logger import setup_logger
+from scraper.query import load_index
+
+logger = setup_logger("query", "INFO")
+
+FILTERS = ("industry", "country", "size", "text")
+YEARS = ("founded_from", "founded_to")
+
+
+def query_args(params: dict) -> dict:
+    """search() keyword arguments from the query string or CLI values, leaving out empty ones"""
+    args = {name: params[name] for name in FILTERS if params.get(name)}
+    for name in YEARS + ("limit",):
+        if params.get(name) not in (None, ""):
+            args[name] = int(params[name])
+    return args
+
+
+def make_handler(index):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def reply(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/stats":
+                return self.reply(200, index.stats())
+            if url.path != "/companies":
+                return self.reply(404, {"error": f"unknown path {url.path}"})
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                args = query_args(params)
+            except ValueError as e:
+                return self.reply(400, {"error": str(e)})
+            self.reply(200, index.search(**args))
+
+        def log_message(self, format, *args):
+            logger.debug("%s %s", self.address_string(), format % args)
+
+    return QueryHandler
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--index", default=config.QUERY_INDEX, help="saved index file")
+    common.add_argument("--input", nargs="*", help="results files (default: the JSON Lines and legacy JSON results)")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("query", parents=[common], help="print the matching companies as JSON")
+    query.add_argument("--industry")
+    query.add_argument("--country")
+    query.add_argument("--size", help='size range, e.g. "11-50" or "10,001+"')
+    query.add_argument("--founded-from", type=int)
+    query.add_argument("--founded-to", type=int)
+    query.add_argument("--text", help="keywords that must all be in the description or specialties")
+    query.add_argument("--limit", type=int, default=20)
+
+    serve = commands.add_parser("serve", parents=[common], help="answer queries over a local HTTP API")
+    serve.add_argument("--port", type=int, default=config.QUERY_PORT)
+
+    commands.add_parser("build", parents=[common], help="rebuild and save the indexes")
+    args = parser.parse_args()
+
+    index = load_index(args.index, args.input, rebuild=args.command == "build", logger=logger)
+    if args.command == "build":
+        print(json.dumps(index.stats(), indent=2))
+    elif args.command == "query":
+        print(json.dumps(index.search(**query_args(vars(args))), indent=2, ensure_ascii=False))
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(index))
+        logger.info(f"Query API on http://127.0.0.1:{args.port} ({len(index.records)} companies)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+    Compact record type for scraped companies, shared by the scraper, the sinks and the exporters
+"""
+import json
+
+from schema import LEGACY_KEYS, SCHEMA, parse_company_size, parse_founding_year
+
+FIELDS = tuple(SCHEMA)
+
+DEFAULTS = {
+    "source_company_transaction": "No transactions found",
+    "source_company_size_min": None,
+    "source_company_size_max": None,
+    "source_founding_year": None,
+}
+
+# one shared encoder instead of setting up json.dumps' options on every record
+ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(", ", ": "))
+
+
+class CompanyRecord:
+    """
+        One company's About data. Slotted, so a record holds its values and
+        nothing else; fields are the ones in schema.SCHEMA.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, **values):
+        for name in FIELDS:
+            setattr(self, name, DEFAULTS.get(name, ""))
+        for name, value in values.items():
+            setattr(self, LEGACY_KEYS.get(name, name), value)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Build a record from a result line, accepting legacy keys and ignoring unknown ones"""
+        record = cls()
+        for key, value in data.items():
+            name = LEGACY_KEYS.get(key, key)
+            if name in SCHEMA:
+                setattr(record, name, value)
+        if record.source_company_size_min is None and record.source_founding_year is None:
+            record.parse_numbers()
+        return record
+
+    def parse_numbers(self):
+        """Fill the numeric fields from the size and founding date texts"""
+        self.source_company_size_min, self.source_company_size_max = parse_company_size(self.source_company_size)
+        self.source_founding_year = parse_founding_year(self.source_founding_date)
+        return self
+
+    def get(self, name: str, default=None):
+        return getattr(self, LEGACY_KEYS.get(name, name), default)
+
+    def __getitem__(self, name: str):
+        try:
+            return getattr(self, LEGACY_KEYS.get(name, name))
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name: str, value):
+        setattr(self, LEGACY_KEYS.get(name, name), value)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompanyRecord):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def values(self) -> tuple:
+        return tuple(getattr(self, name) for name in FIELDS)
+
+    def to_dict(self) -> dict:
+        return dict(zip(FIELDS, self.values()))
+
+    def to_json(self) -> str:
+        """One JSON line (with the newline) for the result files"""
+        return ENCODER.encode(self.to_dict()) + "\n"
+
+    def __repr__(self):
+        return f"CompanyRecord({self.to_dict()!r})"
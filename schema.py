@@ -0,0 +1,112 @@
+"""
+    Field schema of a scraped company record, its validation and value parsers
+"""
+import re
+
+SIZE_RANGE = re.compile(r"([\d,.]+)\s*(?:-|–|to)\s*([\d,.]+)")
+SIZE_OPEN = re.compile(r"([\d,.]+)\s*\+")
+SIZE_SINGLE = re.compile(r"([\d,.]+)")
+YEAR = re.compile(r"\b(1[5-9]\d{2}|20\d{2})\b")
+URL = re.compile(r"^https?://\S+$")
+
+
+class Field:
+    """Expected type of a record field, whether it must be filled and an optional pattern"""
+
+    __slots__ = ("type", "required", "pattern")
+
+    def __init__(self, type, required: bool = False, pattern=None):
+        self.type = type
+        self.required = required
+        self.pattern = pattern
+
+
+# field name -> Field, in output column order
+SCHEMA = {
+    "source_company_name": Field(str, required=True),
+    "source_company_countries": Field(str),
+    "source_company_phone": Field(str),
+    "source_company_sector_or_activity": Field(str),
+    "source_company_business_description": Field(str),
+    "source_company_transaction": Field(str),
+    "source_company_url": Field(str, required=True, pattern=URL),
+    "source_company_specialties": Field(str),
+    "source_founding_date": Field(str),
+    "source_company_size": Field(str),
+    "source_company_website": Field(str),
+    # parsed from the text fields above
+    "source_company_size_min": Field(int),
+    "source_company_size_max": Field(int),
+    "source_founding_year": Field(int),
+}
+
+# keys written by older versions of the scraper -> current field
+LEGACY_KEYS = {
+    "Source_company_url": "source_company_url",
+}
+
+
+class ValidationError(ValueError):
+    """A record does not match the schema"""
+
+
+def to_int(text: str):
+    digits = re.sub(r"[,.\s]", "", text)
+    return int(digits) if digits.isdigit() else None
+
+
+def parse_company_size(text: str):
+    """
+    (min, max) employees from LinkedIn's size text: "11-50 employees" -> (11, 50),
+    "10,001+ employees" -> (10001, None), "1 employee" -> (1, 1); (None, None) if unknown
+    """
+    if not text:
+        return None, None
+    match = SIZE_RANGE.search(text)
+    if match:
+        return to_int(match.group(1)), to_int(match.group(2))
+    match = SIZE_OPEN.search(text)
+    if match:
+        return to_int(match.group(1)), None
+    match = SIZE_SINGLE.search(text)
+    if match:
+        size = to_int(match.group(1))
+        return size, size
+    return None, None
+
+
+def parse_founding_year(text: str):
+    """Founding year from "1998", "Founded in 1998" or a full date; None if there is none"""
+    match = YEAR.search(text or "")
+    return int(match.group(1)) if match else None
+
+
+def validate(record, required_only: bool = False) -> list:
+    """
+    Problems with a record (a CompanyRecord or a dict), empty when it matches
+    the schema. With `required_only` only the required fields are checked:
+    a record failing those is not written.
+    """
+    get = record.get if isinstance(record, dict) else lambda name: getattr(record, name, None)
+    problems = []
+    for name, field in SCHEMA.items():
+        if required_only and not field.required:
+            continue
+        value = get(name)
+        if value is None or value == "":
+            if field.required:
+                problems.append(f"{name} is missing")
+            continue
+        if not isinstance(value, field.type) or isinstance(value, bool):
+            problems.append(f"{name} should be {field.type.__name__}, got {type(value).__name__}")
+        elif field.pattern is not None and not field.pattern.match(value):
+            problems.append(f"{name} is not valid: {value!r}")
+    return problems
+
+
+def check(record):
+    """Raise ValidationError when the record does not match the schema"""
+    problems = validate(record)
+    if problems:
+        raise ValidationError("; ".join(problems))
+    return record
@@ -3,9 +3,12 @@
     Using the command pattern of software design
 """
 import asyncio
+import time
 from contextlib import asynccontextmanager
 from playwright.async_api import Page
 from .handlers.handle_popups import UnexpectedPopupHandler
+from ..metrics import COMMAND_SECONDS, RETRIES
+from ..retry import backoff_delay
 
 
 class Base:
@@ -20,27 +23,23 @@ class Base:
         self.popup_handler = None
 
     async def __aenter__(self):
-        """Initialize popup handler when command starts"""
-        if self.page:
-            self.popup_handler = UnexpectedPopupHandler(self.page)
-            await self.popup_handler.start()
+        """Attach to the page's shared popup handler when command starts"""
+        page = getattr(self, "page", None)
+        if page:
+            self.popup_handler = await UnexpectedPopupHandler.for_page(page)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        """Cleanup popup handler when command completes"""
-        if self.popup_handler:
-            await self.popup_handler.stop()
+        """Release the shared popup handler when command completes"""
+        if getattr(self, "popup_handler", None):
+            await self.popup_handler.release()
 
     @asynccontextmanager
     async def disable_popups(self):
         """Temporarily disable popup handling within a command"""
-        if self.popup_handler:
-            original_state = self.popup_handler.enabled
-            self.popup_handler.enabled = False
-            try:
+        if getattr(self, "popup_handler", None):
+            async with self.popup_handler.disabled():
                 yield
-            finally:
-                self.popup_handler.enabled = original_state
         else:
             yield  # No-op if no handler
 
@@ -51,23 +50,156 @@ class Base:
 
 class linkednController:
     """
-        takes a list of commands and executes them sequentially
+        Schedules commands as a small dependency graph
+
+        Every command is registered under a name and may list the commands it
+        depends on. Commands whose dependencies have finished run concurrently,
+        and a result is handed to the dependents as soon as it is ready through
+        `command.upstream` (a dict of dependency name -> result). A command can
+        also be registered as a factory `lambda upstream: Command(...)` when it
+        can only be built from its inputs (e.g. a scraper needing page content),
+        and such a factory may return None to skip the command.
+
+        A command may get a deadline (`timeout` seconds per attempt) and
+        `retries`: an attempt that raises, times out or returns a result
+        `accept` rejects is run again after an exponential, jittered backoff.
+        A result still rejected by the last attempt fails the command, so the
+        commands depending on it are skipped. Errors with `retryable = False`
+        (a checkpoint) fail the command straight away.
     """
-    def __init__(self):
+    def __init__(self, retry_base: float = 2.0, retry_cap: float = 30.0):
         # self.page = page
-        self.commands = []
+        self.commands = {}
+        self.options = {}
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+        self.attempts = {}
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+
+    def add_command(self, command, name: str = None, depends_on=(), timeout: float = None, retries: int = 0,
+                    accept=None):
+        """Register a command (or factory) and return the name it was stored under"""
+        if name is None:
+            name = f"{type(command).__name__}-{len(self.commands)}"
+        if name in self.commands:
+            raise ValueError(f"Command {name} already added")
+        if isinstance(depends_on, str):
+            depends_on = (depends_on,)
+        self.commands[name] = (command, tuple(depends_on))
+        self.options[name] = (timeout, retries, accept)
+        return name
+
+    def check_graph(self):
+        """Reject unknown dependencies and cycles before anything runs"""
+        for name, (_, depends_on) in self.commands.items():
+            for dependency in depends_on:
+                if dependency not in self.commands:
+                    raise ValueError(f"Command {name} depends on unknown command {dependency}")
+
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through command {name}")
+            visiting.add(name)
+            for dependency in self.commands[name][1]:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.commands:
+            visit(name)
+
+    async def run_command(self, name: str, finished: dict):
+        command, depends_on = self.commands[name]
+        queued = time.perf_counter()
+        for dependency in depends_on:
+            await finished[dependency].wait()
+
+        failed = [dependency for dependency in depends_on if dependency in self.errors]
+        if failed:
+            self.errors[name] = RuntimeError(f"Skipped {name}: dependency {failed[0]} failed")
+            self.timings[name] = {"waited": time.perf_counter() - queued, "seconds": 0.0, "status": "skipped"}
+            finished[name].set()
+            return
+
+        upstream = {dependency: self.results.get(dependency) for dependency in depends_on}
+        started = time.perf_counter()
+        status = "done"
+        try:
+            if not hasattr(command, "execute") and callable(command):
+                command = command(upstream)
+            if command is None:
+                # the factory decided there is nothing to do for these inputs
+                self.results[name] = None
+                status = "skipped"
+                return
+            command.upstream = upstream
+            async with command:
+                self.results[name] = await self.attempt(name, command)
+        except Exception as e:
+            self.errors[name] = e
+            status = "failed"
+        finally:
+            seconds = time.perf_counter() - started
+            self.timings[name] = {"waited": started - queued, "seconds": seconds, "status": status,
+                                  "attempts": self.attempts.get(name, 0)}
+            if command is not None:
+                COMMAND_SECONDS.labels(type(command).__name__).observe(seconds)
+            finished[name].set()
+
+    async def attempt(self, name: str, command):
+        """Execute a command within its deadline, retrying failed attempts with backoff"""
+        timeout, retries, accept = self.options[name]
+        self.attempts[name] = 0
+        while True:
+            self.attempts[name] += 1
+            try:
+                result = await asyncio.wait_for(command.execute(), timeout)
+            except Exception as e:
+                # asyncio.TimeoutError included; cancellation is not retried
+                if self.attempts[name] > retries or not getattr(e, "retryable", True):
+                    raise
+            else:
+                if accept is None or accept(result):
+                    return result
+                if self.attempts[name] > retries:
+                    raise RuntimeError(f"{name} failed after {self.attempts[name]} attempts (result {result!r})")
+            RETRIES.labels(name).inc()
+            await asyncio.sleep(backoff_delay(self.attempts[name], self.retry_base, self.retry_cap))
+
+    async def run(self):
+        """
+            Run every registered command, overlapping the independent ones.
+            Returns a dict of command name -> result and re-raises the first
+            command error once all commands have settled.
+        """
+        self.check_graph()
+        self.results, self.errors, self.timings, self.attempts = {}, {}, {}, {}
+        finished = {name: asyncio.Event() for name in self.commands}
+        await asyncio.gather(*(self.run_command(name, finished) for name in self.commands))
 
-    def add_command(self, command: Base):
-        self.commands.append(command)
+        for name in self.commands:
+            error = self.errors.get(name)
+            if error is not None and self.timings[name]["status"] == "failed":
+                raise error
+        return self.results
 
     async def execute_commands(self):
         all_results = []
-        for command in self.commands:
-            result = await command.execute()
-            if result:  # If the command returns something (e.g., a list of links)
+        results = await self.run()
+        for name in self.commands:
+            result = results.get(name)
+            if isinstance(result, list):  # If the command returns something (e.g., a list of links)
                 all_results.extend(result)
-            return all_results
+            elif result:
+                all_results.append(result)
+        return all_results
 
     def clear_commands(self):
         """Optional method to clear commands between executions."""
-        self.commands = []
+        self.commands = {}
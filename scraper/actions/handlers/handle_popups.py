@@ -1,38 +1,140 @@
-import asyncio
+import json
 import logging
+import weakref
 from contextlib import asynccontextmanager
 from playwright.async_api import Page
+from ...metrics import POPUPS_DISMISSED
 
 logger = logging.getLogger("popup_handler")
 
+# in-page containers that can hold a blocking alert or modal
+ALERT_SELECTORS = [
+    "[role='alert']",
+    "[role='alertdialog']",
+    "[role='dialog']",
+    ".artdeco-modal",
+    ".artdeco-toast-item",
+]
+
+# only containers showing one of these texts are dismissed
+ALERT_TEXTS = [
+    "You don't have access to this profile",
+]
+
+# Watches the DOM for added nodes matching ALERT_SELECTORS + ALERT_TEXTS and
+# reports them through the exposed binding, so nothing is polled while the page is quiet
+OBSERVER_SCRIPT = """
+(([selectors, texts]) => {
+    if (window.__popupObserver || !window.__popupDetected) return;
+    const matches = (el) => {
+        const text = el.innerText || el.textContent || "";
+        return texts.some((t) => text.includes(t));
+    };
+    const report = (el, selector) => {
+        if (el.__popupReported) return;
+        el.__popupReported = true;
+        window.__popupDetected({selector, id: el.id || "", text: (el.innerText || "").slice(0, 200)})
+            .then((handled) => { if (!handled) el.__popupReported = false; })
+            .catch(() => { el.__popupReported = false; });
+    };
+    const scan = (root) => {
+        if (!root || root.nodeType !== 1) return;
+        for (const selector of selectors) {
+            const found = root.matches(selector) ? [root] : [];
+            found.push(...root.querySelectorAll(selector));
+            for (const el of found) if (matches(el)) report(el, selector);
+        }
+    };
+    const start = () => {
+        window.__popupRescan = () => scan(document.body);
+        window.__popupObserver = new MutationObserver((mutations) => {
+            for (const mutation of mutations) {
+                for (const node of mutation.addedNodes) scan(node.nodeType === 1 ? node : node.parentElement);
+            }
+        });
+        window.__popupObserver.observe(document.documentElement, {childList: true, subtree: true});
+        scan(document.body);
+    };
+    if (document.body) start(); else document.addEventListener("DOMContentLoaded", start);
+})(%s)
+""" % json.dumps([ALERT_SELECTORS, ALERT_TEXTS])
+
 
 class UnexpectedPopupHandler:
+    """
+        One handler per page, shared by every command running on it.
+
+        Dialogs and new windows are handled through page events; in-page
+        alerts are reported by a MutationObserver through an exposed binding
+        and dismissed as soon as they appear.
+    """
+
+    # page -> its handler, dropped with the page
+    registry = weakref.WeakKeyDictionary()
+
     def __init__(self, page: Page):
         self.page = page
         self.enabled = True
-        self.known_popups = set()
-        self.handlers = []
-        self.periodic_check_task = None
+        self.installed = False
+        self.users = 0
+        self.dismissed = 0
+
+    @classmethod
+    async def for_page(cls, page: Page):
+        """The page's shared handler, installed on first use"""
+        handler = cls.registry.get(page)
+        if handler is None:
+            handler = cls(page)
+            cls.registry[page] = handler
+            await handler.start()
+        handler.users += 1
+        return handler
+
+    async def release(self):
+        """A command is done with the handler; the observer stays installed for the page's next command"""
+        self.users = max(0, self.users - 1)
 
     async def start(self):
         """Activate all popup monitoring mechanisms"""
+        if self.installed:
+            return
         # Setup event listeners
-        self.handlers = [
-            self.page.on("dialog", self.handle_dialog),
-            self.page.on("popup", self.handle_popup),
-            # self.page.on("load", self.check_page_modals)
-        ]
+        self.page.on("dialog", self.handle_dialog)
+        self.page.on("popup", self.handle_popup)
 
-        # Start periodic background checker
-        self.periodic_check_task = asyncio.create_task(self.periodic_check())
+        # in-page alerts are pushed by the observer, for this document and every later navigation
+        self.installed = True
+        try:
+            await self.page.expose_binding("__popupDetected", self.on_popup_detected)
+            await self.page.add_init_script(OBSERVER_SCRIPT)
+        except Exception as e:
+            logger.warning(f"Popup observer could not be installed: {e}")
+            return
+        try:
+            await self.page.evaluate(OBSERVER_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Popup observer not installed on current document: {e}")
 
     async def stop(self):
         """Deactivate all monitoring"""
         self.enabled = False
-        for handler in self.handlers:
-            await handler.dispose()
-        if self.periodic_check_task:
-            self.periodic_check_task.cancel()
+        self.page.remove_listener("dialog", self.handle_dialog)
+        self.page.remove_listener("popup", self.handle_popup)
+        self.registry.pop(self.page, None)
+
+    async def rescan(self):
+        """Ask the observer to look at the whole page again (after handling was re-enabled)"""
+        try:
+            await self.page.evaluate("() => window.__popupRescan && window.__popupRescan()")
+        except Exception as e:
+            logger.debug(f"Popup rescan failed: {e}")
+
+    async def on_popup_detected(self, source, popup):
+        """Binding called by the in-page observer; returns True when the alert was dismissed"""
+        if not self.enabled:
+            return False
+        logger.warning(f"Alert detected by observer: {popup.get('selector')} {popup.get('text', '')[:80]}")
+        return await self.handle_dismissible_alert()
 
     async def handle_dialog(self, dialog):
         """Handle JavaScript dialogs (alert, confirm, prompt)"""
@@ -41,6 +143,7 @@ class UnexpectedPopupHandler:
 
         logger.warning(f"Dismissing unexpected dialog: {dialog.type()} - {dialog.message}")
         await dialog.dismiss()
+        POPUPS_DISMISSED.labels("dialog").inc()
 
     async def handle_popup(self, popup):
         """Handle new browser windows/tabs"""
@@ -49,160 +152,34 @@ class UnexpectedPopupHandler:
 
         logger.warning(f"Closing unexpected popup: {popup.url}")
         await popup.close()
+        POPUPS_DISMISSED.labels("window").inc()
 
     async def handle_dismissible_alert(self):
         """
-        Detects and dismisses access restriction alerts with drop shadow.
-        Looks for an alert containing the message:
-        "You don't have access to this profile"
-        and attempts to click "Got it" or "X" to dismiss it.
+        Dismisses an access restriction alert reported by the observer, e.g.
+        "You don't have access to this profile", with "Got it" or "X".
         """
         if not self.enabled:
-            return
+            return False
 
         dismiss_selectors = [
             # LinkedIn dismiss and got it buttons
-            "button:has-text('Got it')",
-            "button[aria-label='Dismiss']",
-        ]
-
-        text_contents = [
-         "You don't have access to this profile"
+            ("button:has-text('Got it')", "'Got it' button"),
+            ("button[aria-label='Dismiss']", "'X' button"),
         ]
 
-        try:
-            for selector in dismiss_selectors:
-                try:
-                    elements = await self.page.query_selector_all(selector)
-                    for element in elements:
-                        for text in text_contents:
-                            if text in element.inner_text:
-                                try:
-                                    # self.logger.info(f"Restriction popup not visible {e}")
-                                    # Try clicking the "Got it" button if visible
-                                    got_it_button = self.page.locator("button:has-text('Got it')")
-                                    if await got_it_button.is_visible():
-                                        await got_it_button.click()
-                                        logger.info("Dismissed alert with 'Got it' button")
-                                        return True
-
-                                    # Fallback: Try closing with 'X' button
-                                    close_button = self.page.locator("button[aria-label='Dismiss']")  # Adjust if needed
-                                    if await close_button.is_visible():
-                                        await close_button.click()
-                                        logger.info("Dismissed alert with 'X' button")
-                                        return True
-                                except Exception as e:
-                                    logger.warning(f"Alert was visible but no dismiss button was found {e}")
-                except Exception as e:
-                    logger.info(f'Alert not Dismissed {e}')
-            #
-            # # Wait for the alert to appear within 3 seconds
-            # try:
-            #     from ..utilities import hover_if_text
-            #     seen = await hover_if_text(self, "You don't have access to this profile")
-            #     if seen:
-            #         try:
-            #             # self.logger.info(f"Restriction popup not visible {e}")
-            #             # Try clicking the "Got it" button if visible
-            #             got_it_button = self.page.locator("button:has-text('Got it')")
-            #             if await got_it_button.is_visible():
-            #                 await got_it_button.click()
-            #                 logger.info("Dismissed alert with 'Got it' button")
-            #                 return True
-            #
-            #             # Fallback: Try closing with 'X' button
-            #             close_button = self.page.locator("button[aria-label='Dismiss']")  # Adjust if needed
-            #             if await close_button.is_visible():
-            #                 await close_button.click()
-            #                 logger.info("Dismissed alert with 'X' button")
-            #                 return True
-            #         except Exception as e:
-            #             logger.warning(f"Alert was visible but no dismiss button was found {e}")
-            # except Exception as e:
-            #     logger.error(f"Failed to handle access alert: {str(e)}")
-        except Exception as e:
-            logger.debug(f"No relevant alert detected or different alert shown {e}")
-        return False
-
-    async def check_page_modals(self):
-        """Check for in-page modals"""
-        if not self.enabled:
-            return
-
-        modal_selectors = [
-            # Common modal patterns
-            "[role='alert']",
-            "[role='dialog']",
-            ".modal",
-            ".popup",
-            ".overlay",
-
-            # Platform-specific (LinkedIn, Salesforce, etc.)
-
-
-            ".cookie-banner",  # GDPR cookie banners
-            "[data-test-id='auth-wall']",
-            "#tcp-modal",  # Common marketing modals
-            ".ab-in-app-message",  # Marketing popups
-        ]
-
-        for selector in modal_selectors:
-            try:
-                elements = await self.page.query_selector_all(selector)
-                for element in elements:
-                    element_id = await element.evaluate("el => el.id || el.className")
-                    if element_id not in self.known_popups:
-                        logger.warning(f"Closing unexpected modal: {selector}")
-                        await self.close_modal(element)
-                        self.known_popups.add(element_id)
-            except Exception as e:
-                logger.debug(f"Modal check error: {str(e)}")
-
-    async def close_modal(self, element):
-        """Attempt various strategies to close a modal"""
-        try:
-            # Strategy 1: Look for close buttons
-            close_buttons = await element.query_selector_all(
-                "button[aria-label='Close'], button[aria-label='Dismiss'], "
-                "[data-testid='dismiss-modal'], .close-button, .btn-close"
-            )
-
-            if close_buttons:
-                await close_buttons[0].click()
-                await self.page.wait_for_timeout(500)
-                return True
-
-            # Strategy 2: Click outside modal
-            bounding_box = await element.bounding_box()
-            if bounding_box:
-                await self.page.mouse.click(
-                    bounding_box["x"] - 10,
-                    bounding_box["y"] - 10
-                )
-                await self.page.wait_for_timeout(500)
-                return True
-
-            # Strategy 3: Press Escape
-            await self.page.keyboard.press("Escape")
-            await self.page.wait_for_timeout(500)
-            return True
-
-        except Exception as e:
-            logger.debug(f"Modal close failed: {str(e)}")
-            return False
-
-    async def periodic_check(self):
-        """Background task to periodically check for popups"""
-        while self.enabled:
+        for selector, label in dismiss_selectors:
             try:
-                # await self.check_page_modals()
-                await self.handle_dismissible_alert()
-                await asyncio.sleep(3)  # Check every 3 seconds
-            except asyncio.CancelledError:
-                return
+                button = self.page.locator(selector).first
+                if await button.is_visible():
+                    await button.click()
+                    self.dismissed += 1
+                    POPUPS_DISMISSED.labels("alert").inc()
+                    logger.info(f"Dismissed alert with {label}")
+                    return True
             except Exception as e:
-                logger.debug(f"Periodic check error: {str(e)}")
+                logger.warning(f"Alert was visible but {label} could not be clicked {e}")
+        return False
 
     @asynccontextmanager
     async def disabled(self):
@@ -213,3 +190,6 @@ class UnexpectedPopupHandler:
             yield
         finally:
             self.enabled = was_enabled
+            if was_enabled:
+                # alerts that appeared meanwhile were not dismissed, look again
+                await self.rescan()
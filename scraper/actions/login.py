@@ -5,7 +5,7 @@ import json
 import random
 from pathlib import Path
 from ..logger import setup_logger
-from scraper.main import delay, short_delay
+from scraper.pacing import pacer as shared_pacer
 from .utilities import check_if_click_successful, check_if_its_visible, click_with_fallback, hover_with_fallback, \
     device_auth_confirmation
 from dotenv import load_dotenv
@@ -29,21 +29,31 @@ class loginAcct(Base):
         login an account with required inputs from pages
     """
 
-    def __init__(self, page, context, url: str, logger):
+    def __init__(self, page, context, url: str, logger, account: dict = None, pacer=None):
+        """
+        :param account: {"username", "password", "cookies"} of the account to sign in,
+            defaults to USERNAME/PASSWORD from the environment and scraper/cookies.json
+        :param pacer: the account's pacer, defaults to the shared one
+        """
         self.page = page
         self.url = url
         self.context = context
         self.logger = logger
+        self.account = account
+        self.pacer = pacer or shared_pacer
         logger.info("initialized successfully")
 
     # save login cookies
-    async def save_cookies(self, file_path=cookies_filepath):
-        self.logger.info(f"Attempting to save cookies to: {cookies_filepath}")
+    async def save_cookies(self, file_path=None):
+        if file_path is None:
+            file_path = Path(self.account["cookies"]) if self.account else cookies_filepath
+        self.logger.info(f"Attempting to save cookies to: {file_path}")
         try:
             cookies = await self.context.cookies()
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
             with open(file_path, 'w') as f:
                 json.dump(cookies, f, indent=4)  # Added indent for readability in JSON file
-            self.logger.info(f"Login cookies successfully saved to {cookies_filepath}")
+            self.logger.info(f"Login cookies successfully saved to {file_path}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to save login cookies: {e}")
@@ -53,7 +63,7 @@ class loginAcct(Base):
 
     # login if it auto logs out
     @staticmethod
-    async def sign_in(page, context, logger):
+    async def sign_in(page, context, logger, account: dict = None, pacer=None):
 
         """
 
@@ -65,8 +75,13 @@ class loginAcct(Base):
         :param logger:
         :param page:
         :param context:
+        :param account: credentials to use instead of USERNAME/PASSWORD
+        :param pacer: the account's pacer
         :return:
         """
+        pacer = pacer or shared_pacer
+        email = account["username"] if account else username
+        secret = account["password"] if account else password
 
         login_button = await page.get_by_text("Sign in with email").is_visible()
         if login_button:
@@ -77,22 +92,22 @@ class loginAcct(Base):
             return "Not Visible"
         await page.wait_for_load_state()
         await page.locator("input[name='session_key']").click()
-        await asyncio.sleep(delay)
+        await pacer.wait("think")
 
         # email = input("email: ")
-        await page.locator("input[name='session_key']").fill(username)
+        await page.locator("input[name='session_key']").fill(email)
 
         await page.get_by_label("Password", exact=True).click()
         # password = input("enter password: ")
-        await asyncio.sleep(short_delay)
+        await pacer.wait("think")
 
-        await page.get_by_label("Password", exact=True).fill(password)
-        await asyncio.sleep(short_delay)
+        await page.get_by_label("Password", exact=True).fill(secret)
+        await pacer.wait("think")
 
         signin = await page.get_by_role("button", name="Sign in", exact=True).is_visible()
         if signin:
             await page.get_by_role("button", name="Sign in", exact=True).click()
-            await asyncio.sleep(delay)
+            await pacer.wait("navigate")
             logger.info("Login button click success")
 
             # check if signin expired
@@ -121,22 +136,22 @@ class loginAcct(Base):
                                     return "Not Visible"
                                 await page.wait_for_load_state()
                                 await page.locator("input[name='session_key']").click()
-                                await asyncio.sleep(delay)
+                                await pacer.wait("think")
 
                                 # email = input("email: ")
-                                await page.locator("input[name='session_key']").fill(username)
+                                await page.locator("input[name='session_key']").fill(email)
 
                                 await page.get_by_label("Password", exact=True).click()
                                 # password = input("enter password: ")
-                                await asyncio.sleep(short_delay)
+                                await pacer.wait("think")
 
-                                await page.get_by_label("Password", exact=True).fill(password)
-                                await asyncio.sleep(short_delay)
+                                await page.get_by_label("Password", exact=True).fill(secret)
+                                await pacer.wait("think")
 
                                 signin = await page.get_by_role("button", name="Sign in", exact=True).is_visible()
                                 if signin:
                                     await page.get_by_role("button", name="Sign in", exact=True).click()
-                                    await asyncio.sleep(delay)
+                                    await pacer.wait("navigate")
                                     logger.info("Login button click success")
 
                     selector = "input#recognizedDevice.large-input"
@@ -174,7 +189,7 @@ class loginAcct(Base):
         if login_button:
             #     logger.error("Session continued failed for user")
             #     # await login()
-            await self.sign_in(self.page, self.context, self.logger)
+            await self.sign_in(self.page, self.context, self.logger, account=self.account, pacer=self.pacer)
             self.logger.info(f"Session continued successful for")
             await self.page.wait_for_load_state()
 
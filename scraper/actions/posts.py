@@ -0,0 +1,154 @@
+"""
+    Company Posts feed, scraped while scrolling
+"""
+import time
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from scraper.actions.base import Base
+from ..cache import company_root
+from ..metrics import PAGE_LOAD_SECONDS
+from ..pacing import pacer as shared_pacer
+from ..sinks import JsonlResultWriter, posts_filepath
+
+POST_SELECTOR = "div.feed-shared-update-v2[data-urn]"
+
+# returns only the articles not handed out before and marks them, so every
+# round costs as much as the posts it adds rather than the whole feed
+EXTRACT_NEW_POSTS = """
+selector => {
+    const text = (root, query) => {
+        const el = root.querySelector(query);
+        return el ? el.innerText.replace(/\\s+/g, " ").trim() : "";
+    };
+    const posts = [];
+    for (const article of document.querySelectorAll(`${selector}:not([data-scraped])`)) {
+        article.setAttribute("data-scraped", "1");
+        posts.push({
+            urn: article.getAttribute("data-urn"),
+            author: text(article, ".update-components-actor__title span[aria-hidden='true']"),
+            posted: text(article, ".update-components-actor__sub-description span[aria-hidden='true']"),
+            text: text(article, ".update-components-text"),
+            reactions: text(article, ".social-details-social-counts__reactions-count"),
+            comments: text(article, ".social-details-social-counts__comments"),
+        });
+    }
+    return posts;
+}
+"""
+
+NEW_POSTS_LOADED = """
+selector => document.querySelector(`${selector}:not([data-scraped])`) !== null
+"""
+
+
+class CompanyPostsScraper(Base):
+    """
+        Opens a company's Posts feed and scrolls it, streaming every new post
+        to the sink as soon as it is on the page.
+
+        Posts are de-duplicated by activity URN. Scrolling stops after
+        `max_posts`, when `idle_rounds` scrolls in a row load nothing new, or
+        when `stop_after_seen` posts in a row were already scraped by an
+        earlier run (one seen post alone may just be a pinned one).
+    """
+
+    def __init__(self, page, company: str, logger, company_url: str = None, sink=None, store=None, pacer=None,
+                 max_posts: int = 200, idle_rounds: int = 3, stop_after_seen: int = 3, load_timeout: int = 5000):
+        """
+        :param company_url: company page URL, defaults to the company the page is on
+        :param sink: result writer for the posts, else scraper/results/company_posts.jsonl
+        :param store: SeenPostStore of URNs scraped by earlier runs
+        """
+        super().__init__(page)
+        self.company = company
+        self.logger = logger
+        self.company_url = company_url
+        self.sink = sink
+        self.store = store
+        self.pacer = pacer or shared_pacer
+        self.max_posts = max_posts
+        self.idle_rounds = idle_rounds
+        self.stop_after_seen = stop_after_seen
+        self.load_timeout = load_timeout
+
+    async def open_feed(self) -> bool:
+        root = company_root(self.company_url or self.page.url)
+        if not root:
+            self.logger.error(f"No company page to read posts from for {self.company} ({self.page.url})")
+            return False
+        await self.pacer.wait("navigate")
+        started = time.perf_counter()
+        await self.page.goto(f"{root}posts/?feedView=all")
+        await self.page.wait_for_load_state()
+        seconds = time.perf_counter() - started
+        self.pacer.observe_load(seconds)
+        PAGE_LOAD_SECONDS.labels("posts").observe(seconds)
+        return not self.pacer.check_url(self.page.url)
+
+    async def wait_for_new_posts(self) -> bool:
+        try:
+            await self.page.wait_for_function(NEW_POSTS_LOADED, arg=POST_SELECTOR, timeout=self.load_timeout)
+            return True
+        except (TimeoutError, PlaywrightTimeoutError):
+            return False
+
+    async def stream_posts(self, sink) -> dict:
+        urns = set()
+        seen_in_a_row = 0
+        idle = 0
+        rounds = 0
+        stopped_early = False
+
+        await self.wait_for_new_posts()
+        while len(urns) < self.max_posts and idle < self.idle_rounds and not stopped_early:
+            rounds += 1
+            batch = await self.page.evaluate(EXTRACT_NEW_POSTS, POST_SELECTOR)
+            new = []
+            for post in batch:
+                urn = post["urn"]
+                if urn in urns:
+                    continue
+                if self.store is not None and self.store.seen(self.company, urn):
+                    seen_in_a_row += 1
+                    if seen_in_a_row >= self.stop_after_seen:
+                        stopped_early = True
+                        break
+                    continue
+                seen_in_a_row = 0
+                urns.add(urn)
+                post["company"] = self.company
+                post["source_url"] = self.page.url
+                sink.write(post)
+                new.append(urn)
+                if len(urns) >= self.max_posts:
+                    break
+            if self.store is not None and new:
+                self.store.add(self.company, new)
+            idle = 0 if batch else idle + 1
+            self.logger.info(f"Posts round {rounds} for {self.company}: {len(batch)} on page, {len(new)} new")
+            if stopped_early or len(urns) >= self.max_posts:
+                break
+
+            await self.pacer.wait("scroll")
+            await self.page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+            await self.wait_for_new_posts()
+
+        return {"company": self.company, "posts": len(urns), "rounds": rounds, "stopped_early": stopped_early}
+
+    async def execute(self):
+        summary = {"company": self.company, "posts": 0, "rounds": 0, "stopped_early": False}
+        # posts are extra: a failure here is logged without failing the company's About page
+        try:
+            if not await self.open_feed():
+                return summary
+            if self.sink is not None:
+                summary = await self.stream_posts(self.sink)
+            else:
+                async with JsonlResultWriter(path=posts_filepath, logger=self.logger) as sink:
+                    summary = await self.stream_posts(sink)
+        except Exception as e:
+            self.logger.error(f"Posts scraping failed for {self.company}: {e}")
+            summary["error"] = str(e)
+        self.logger.info(f"Posts scraped {summary}")
+        return summary
@@ -1,75 +1,152 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
+import logging
 import re
-import json
-import os
 from pathlib import Path
-import re
+import time
+import hashlib
 from scraper.actions.base import Base
-from playwright.async_api import Page
-import asyncio
-import json
-import random
-import os
-from pathlib import Path
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 from ..logger import setup_logger
+from ..metrics import PARSE_SECONDS
+from ..sinks import serialize
+from models import CompanyRecord
+from schema import validate
+
+# lxml builds the tree several times faster than the pure Python parser, use it when installed
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
+# selectors compiled once and shared by every scraper instance
+NAME_SELECTOR = sv.compile('h1.org-top-card-summary__title')
+WEBSITE_SELECTOR = sv.compile('dt h3')
+OVERVIEW_SELECTOR = sv.compile('section.org-about-module__margin-bottom')
+DESCRIPTION_SELECTOR = sv.compile('p.break-words.white-space-pre-wrap')
+DETAIL_SELECTOR = sv.compile('dt')
+LOCATIONS_SELECTOR = sv.compile('h3:-soup-contains("Locations")')
+ADDRESS_SELECTOR = sv.compile('p.t-14.t-black--light.t-normal')
+
+
+def about_fragments(name, attrs):
+    """
+    SoupStrainer filter that keeps only what the extractors read: the top card
+    title, the About module, the Locations heading and the location cards.
+    """
+    classes = attrs.get("class") or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    if name == "h1":
+        return "org-top-card-summary__title" in classes
+    if name == "section":
+        return "org-about-module__margin-bottom" in classes
+    return name == "h3" or "org-location-card" in classes
+
+
+ABOUT_STRAINER = SoupStrainer(about_fragments)
+
+
+class PageSnapshot(Base):
+    """Capture the current page HTML and URL for the parsing commands"""
+
+    async def execute(self):
+        return await self.page.content(), self.page.url
+
+
+# the fragments the extractors read (see about_fragments), in a fixed order
+ABOUT_MODULE = "section.org-about-module__margin-bottom"
+FRAGMENT_SELECTORS = ("h1.org-top-card-summary__title", ABOUT_MODULE, ".org-location-card")
+
+# text of every fragment, grouped by selector; text only, so ember ids,
+# tracking attributes and markup churn do not change the fingerprint
+ABOUT_FRAGMENT_TEXTS = """
+selectors => selectors.map(selector => Array.from(
+    document.querySelectorAll(selector), el => el.textContent.replace(/\\s+/g, " ").trim()
+).filter(Boolean))
+"""
+
+
+def fingerprint_fragments(groups):
+    """
+    sha256 of the About fragment texts (one list per selector), or None unless
+    every fragment is on the page: a half-rendered page is captured rather
+    than risk matching the last run's fingerprint
+    """
+    if not groups or not all(groups):
+        return None
+    return hashlib.sha256("\x1e".join("\x1f".join(texts) for texts in groups).encode("utf-8")).hexdigest()
+
+
+class AboutFingerprint(Base):
+    """Fingerprint the About fragments in the page, without capturing or parsing the whole page"""
+
+    async def execute(self):
+        try:
+            await self.page.wait_for_selector(ABOUT_MODULE, state="attached")
+        except PlaywrightTimeoutError:
+            return None
+        return fingerprint_fragments(await self.page.evaluate(ABOUT_FRAGMENT_TEXTS, list(FRAGMENT_SELECTORS)))
 
 
 class CompanyAboutScraper(Base):
 
     # logger = setup_logger("linkedn", "INFO")
 
-    def __init__(self, page_content, source_url, logger):
-        self.soup = BeautifulSoup(page_content, 'html.parser')
+    def __init__(self, page_content, source_url, logger, parser=None, scoped=True, sink=None):
+        """
+        :param parser: BeautifulSoup tree builder, lxml when installed else html.parser
+        :param scoped: only build the About fragments instead of the whole page
+        :param sink: long-lived result writer (JsonlResultWriter), else one append per record
+        """
+        started = time.perf_counter()
+        self.soup = BeautifulSoup(page_content, parser or DEFAULT_PARSER,
+                                  parse_only=ABOUT_STRAINER if scoped else None)
+        self.build_seconds = time.perf_counter() - started
         self.source_url = source_url
         self.logger = logger
-        self.data = {
-            "source_company_name": "",
-            "source_company_countries": "",
-            "source_company_phone": "",
-            "source_company_sector_or_activity": "",
-            "source_company_business_description": "",
-            "source_company_transaction": "No transactions found",
-            "Source_company_url": source_url,
-            "source_company_specialties": "",
-            "source_founding_date": "",
-            "source_company_size": "",
-            "source_company_website": "",
-
-        }
+        self.sink = sink
+        self.data = CompanyRecord(source_company_url=source_url)
 
     def extract_company_name(self):
         """Extract company name from the page header"""
-        header = self.soup.select_one('h1.org-top-card-summary__title')
+        header = NAME_SELECTOR.select_one(self.soup)
         if header:
-            self.data["source_company_name"] = header.get_text(strip=True)
+            self.data.source_company_name = header.get_text(strip=True)
             self.logger.info("Extracting company Name Successful")
 
     def extract_company_website(self):
         """Extract company website from the page overview"""
         try:
-            header = self.soup.select_one('dt h3')
-            if header:
-                self.data["source_company_name"] = header.get_text(strip=True)
-                self.logger.info("Extracting company Name Successful")
+            for header in WEBSITE_SELECTOR.select(self.soup):
+                if "Website" not in header.get_text(strip=True):
+                    continue
+                dd = header.find_parent('dt').find_next_sibling('dd')
+                link = dd.find('a') if dd else None
+                if link:
+                    self.data.source_company_website = link.get_text(strip=True)
+                    self.logger.info("Extracting company website Successful")
+                return
         except Exception as e:
             self.logger.info(f"Extracting company website failed: {e}")
 
     def extract_overview_section(self):
         """Extract data from the Overview section"""
-        overview_section = self.soup.select_one('section.org-about-module__margin-bottom')
+        overview_section = OVERVIEW_SELECTOR.select_one(self.soup)
         if not overview_section:
             return
 
         # Extract description
-        description = overview_section.select_one('p.break-words.white-space-pre-wrap')
+        description = DESCRIPTION_SELECTOR.select_one(overview_section)
         if description:
             desc_text = description.get_text(strip=True)
             # Limit to 50 words
             words = desc_text.split()[:50]
-            self.data["source_company_business_description"] = ' '.join(words)
+            self.data.source_company_business_description = ' '.join(words)
 
         # Extract details from definition list
-        for dt in overview_section.select('dt'):
+        for dt in DETAIL_SELECTOR.select(overview_section):
             key = dt.get_text(strip=True)
             dd = dt.find_next_sibling('dd')
             if not dd:
@@ -78,41 +155,41 @@ class CompanyAboutScraper(Base):
             value = dd.get_text(strip=True)
 
             if "Industry" in key:
-                self.data["source_company_sector_or_activity"] = value
+                self.data.source_company_sector_or_activity = value
             elif "Website" in key:
                 # Extract website URL
                 link = dd.find('a')
                 if link:
-                    self.data["source_company_website"] = link.get_text(strip=True)
+                    self.data.source_company_website = link.get_text(strip=True)
             elif "Phone" in key:
                 # Extract phone number
                 link = dd.find('a')
                 if link:
-                    self.data["source_company_phone"] = link.get_text(strip=True)
+                    self.data.source_company_phone = link.get_text(strip=True)
             elif "Company size" in key:
-                self.data["source_company_size"] = value
+                self.data.source_company_size = value
             elif "Founded" in key:
-                self.data["source_founding_date"] = value
+                self.data.source_founding_date = value
             elif "Specialties" in key:
-                self.data["source_company_specialties"] = value
-            self.logger.info(self.data)
+                self.data.source_company_specialties = value
+            self.logger.debug("%s", self.data)
 
     def extract_locations_section(self):
         """Extract country from locations section"""
-        locations_section = self.soup.select_one('h3:-soup-contains("Locations")')
+        locations_section = LOCATIONS_SELECTOR.select_one(self.soup)
         if not locations_section:
             return
 
         # Find primary location
         primary_location = locations_section.find_next(class_='org-location-card')
         if primary_location:
-            address = primary_location.select_one('p.t-14.t-black--light.t-normal')
+            address = ADDRESS_SELECTOR.select_one(primary_location)
             if address:
                 address_text = address.get_text(strip=True)
                 # Extract country from address (last part after comma)
                 country = address_text.split(',')[-1].strip()
                 # Clean country code (e.g., "MZ" -> "Mozambique")
-                self.data["source_company_countries"] = country
+                self.data.source_company_countries = country
 
     # def map_country_code(self, code):
     #     """Map country codes to full country names"""
@@ -133,37 +210,43 @@ class CompanyAboutScraper(Base):
         # For now, we'll leave the default "No transactions found"
         pass
 
-    def scrape(self):
-        """Execute all extraction methods"""
+    def extract(self):
+        """Run all extraction methods and return the company data"""
         self.extract_company_name()
         self.extract_overview_section()
+        if not self.data.source_company_website:
+            self.extract_company_website()
         self.extract_locations_section()
         # self.extract_transactions()
-        self.save_to_json()
+        self.data.parse_numbers()
+        problems = validate(self.data)
+        if problems:
+            self.logger.warning(f"Record for {self.source_url} does not match the schema: {problems}")
+        return self.data
+
+    def scrape(self):
+        """Execute all extraction methods; a record missing a required field is not saved"""
+        self.extract()
+        problems = validate(self.data, required_only=True)
+        if problems:
+            self.logger.error(f"Record for {self.source_url} not saved, required fields failed: {problems}")
+        else:
+            self.save_to_json()
 
         return self.data
 
     def save_to_json(self, filename=None):
-        """Save extracted data to JSON file"""
-        if not filename:
-            # Generate filename from company name
-            company_slug = re.sub(r'[^a-zA-Z0-9]+', '-', self.data["source_company_name"]).strip('-')
-            # filename = f"{company_slug}_about.json"
-            filename = f"companies_about.json"
-
-        base_folder = Path(__name__).resolve().parent
-        results_dir = base_folder / "scraper" / "results"
-        results_dir.mkdir(parents=True, exist_ok=True)
-        # Now, define the full path to the file itself
-        filepath = results_dir / filename
-        with open(filepath, 'a', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
-
-        return str(filepath)
+        """Save extracted data to the result sink, or straight to the JSON Lines file"""
+        if self.sink is not None and filename is None:
+            self.sink.write(self.data)
+            return str(self.sink.path)
+        return save_company_data(self.data, filename)
 
     async def execute(self):
         # Extract data
+        started = time.perf_counter()
         company_data = self.scrape()
+        PARSE_SECONDS.labels("inline").observe(self.build_seconds + time.perf_counter() - started)
         self.logger.info(f'{company_data}')
 
         # Save to JSON
@@ -172,3 +255,32 @@ class CompanyAboutScraper(Base):
         self.logger.info(f"{company_data}")
 
         return company_data
+
+
+def save_company_data(data, filename=None):
+    """Append one company's data as a JSON line to the results file"""
+    if not filename:
+        # Generate filename from company name
+        company_slug = re.sub(r'[^a-zA-Z0-9]+', '-', data.get("source_company_name") or "").strip('-')
+        # filename = f"{company_slug}_about.json"
+        filename = f"companies_about.jsonl"
+
+    base_folder = Path(__name__).resolve().parent
+    results_dir = base_folder / "scraper" / "results"
+    results_dir.mkdir(parents=True, exist_ok=True)
+    # Now, define the full path to the file itself
+    filepath = results_dir / filename
+    with open(filepath, 'a', encoding='utf-8') as f:
+        f.write(serialize(data))
+
+    return str(filepath)
+
+
+def parse_company_about(page_content, source_url, parser=None, scoped=True):
+    """
+    Parse an About page and return the company data without saving it.
+    Kept at module level so it can be sent to a process pool worker.
+    """
+    scraper = CompanyAboutScraper(page_content, source_url, logger=logging.getLogger("linkedn.parser"),
+                                  parser=parser, scoped=scoped)
+    return scraper.extract()
@@ -1,14 +1,20 @@
 import re
 from scraper.actions.base import Base
-from playwright.async_api import Page
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 import asyncio
 import json
 import random
 import os
 from pathlib import Path
-from scraper.main import delay, short_delay
+import time
+import config
 from .utilities import check_if_click_successful, check_if_its_visible, click_with_fallback, hover_with_fallback, \
     select_first_company_result
+from ..cache import company_root
+from ..metrics import PAGE_LOAD_SECONDS, SELECTOR_FALLBACKS
+from ..pacing import CheckpointError, pacer as shared_pacer
+from ..strategies import strategies
+from ..timing import step_timer
 
 # Configure logging to display messages to the terminal
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[logging.StreamHandler()])
@@ -18,6 +24,37 @@ from ..logger import setup_logger
 parent_dir = os.path.dirname(os.path.dirname(__file__))  # Get the parent directory of the current directory
 companies_filepath = os.path.join(parent_dir, "scraper/companies.json")
 
+RESULT_CARD_SELECTOR = "div[data-chameleon-result-urn]"
+
+# every result card in one round trip; the snippets are read from the card's
+# text lines since their class names change more often than their layout
+HARVEST_RESULT_CARDS = """
+selector => Array.from(document.querySelectorAll(selector), card => {
+    const link = card.querySelector("a[href*='/company/']");
+    const title = card.querySelector(".entity-result__title-text a span[aria-hidden='true'], .entity-result__title-text a")
+        || link;
+    return {
+        urn: card.getAttribute("data-chameleon-result-urn"),
+        name: title ? title.innerText.replace(/\\s+/g, " ").trim() : "",
+        url: link ? link.href : "",
+        lines: card.innerText.split("\\n").map(line => line.trim()).filter(Boolean),
+    };
+})
+"""
+FOLLOWERS = re.compile(r"([\d.,]+\s*[KkMm]?)\s+followers")
+# LinkedIn separates the industry and location with a bullet, some layouts with a middle dot
+SUBTITLE_SEPARATOR = re.compile(r"\s*[•·]\s*")
+
+
+def parse_result_card(card: dict) -> dict:
+    """URN, name, URL and the industry / location / followers snippets of a harvested card"""
+    lines = card.pop("lines", [])
+    name = card.get("name") or (lines[0] if lines else "")
+    subtitle = next((line for line in lines if SUBTITLE_SEPARATOR.search(line) and "followers" not in line), "")
+    industry, location = [part.strip() for part in SUBTITLE_SEPARATOR.split(subtitle, maxsplit=1) + [""]][:2]
+    followers = next((match.group(1) for match in map(FOLLOWERS.search, lines) if match), "")
+    return dict(card, name=name, industry=industry, location=location, followers=followers)
+
 
 class search(Base):
     """
@@ -27,14 +64,94 @@ class search(Base):
 
     # logger = setup_logger("linkedn", "INFO")
 
-    def __init__(self, page, context, name: str, logger):
+    def __init__(self, page, context, name: str, logger, cache=None, pacer=None, company_url: str = None):
         super().__init__()  # <--- ADD THIS LINE! Pass the 'page' argument up to Base.__init__
         self.page = page
         self.name = name
         self.context = context
         self.logger = logger
+        self.cache = cache
+        # company page given with the input row, opened like a cached one
+        self.company_url = company_root(company_url)
+        # waits and rate limit shared by every worker on the same account
+        self.pacer = pacer or shared_pacer
         self.logger.info("initialized successfully")
 
+    async def timed(self, step: str, coroutine):
+        """Await a search step and record how long it took"""
+        started = time.perf_counter()
+        try:
+            return await coroutine
+        finally:
+            step_timer.record(step, time.perf_counter() - started)
+
+    def page_loaded(self, step: str, seconds: float):
+        """Feed a page load time to the pacer and the metrics"""
+        self.pacer.observe_load(seconds)
+        PAGE_LOAD_SECONDS.labels(step).observe(seconds)
+
+    def record_attempt(self, group: str, candidate: str, ok: bool, started: float):
+        """Record a selector candidate's outcome; a failed one means falling through to the next"""
+        strategies.record(group, candidate, ok, time.perf_counter() - started)
+        if not ok:
+            SELECTOR_FALLBACKS.labels(group).inc()
+
+    async def open_cached_about(self):
+        """
+        Fast path: go straight to `<company url>/about/` when the input gave the
+        company page or the name was resolved before. Falls back to the search UI
+        (and drops the cache entry) if the page does not land on that company;
+        a checkpoint raises CheckpointError instead, the search would hit it too.
+        """
+        company_url = self.company_url
+        if company_url:
+            self.logger.info(f"Input URL for {self.name}: {company_url}")
+        elif self.cache:
+            company_url = self.cache.get(self.name)
+            if company_url:
+                self.logger.info(f"Resolution cache hit for {self.name}: {company_url}")
+        if not company_url:
+            return False
+
+        await self.pacer.wait("navigate")
+        try:
+            started = time.perf_counter()
+            await self.page.goto(f"{company_url}about/")
+            await self.page.wait_for_load_state()
+            seconds = time.perf_counter() - started
+            self.page_loaded("cached_about", seconds)
+            step_timer.record("cached_about", seconds)
+        except Exception as e:
+            self.pacer.throttled("cached About page failed to load")
+            self.logger.warning(f"Cached About page failed to load for {self.name}: {e}")
+        if self.pacer.check_url(self.page.url):
+            raise CheckpointError(f"Cached About page for {self.name} redirected to {self.page.url}")
+
+        if company_root(self.page.url) == company_url:
+            return True
+
+        self.logger.warning(f"URL {company_url} for {self.name} landed on {self.page.url}, searching instead")
+        if company_url != self.company_url:
+            self.cache.invalidate(self.name)
+        return False
+
+    async def harvest_result_cards(self, selector: str = RESULT_CARD_SELECTOR):
+        """
+        Cache every company on the results page, not just the one clicked, so
+        later companies of the batch listed here skip their own search
+        """
+        if not self.cache:
+            return 0
+        try:
+            await self.page.wait_for_selector(selector, state="visible", timeout=15000)
+            cards = await self.page.evaluate(HARVEST_RESULT_CARDS, selector)
+        except Exception as e:
+            self.logger.warning(f"Could not read the search result cards for {self.name}: {e}")
+            return 0
+        cards = [parse_result_card(card) for card in cards]
+        self.logger.debug(f"Search result cards for {self.name}: {cards}")
+        return self.cache.put_many(cards)
+
     # load cookies if it exists
     async def search_name(self):
         # await self.page.wait_for_load_state()
@@ -50,14 +167,22 @@ class search(Base):
             click_search = await click_with_fallback(self.page, selector, self.logger)
             self.logger.info(f"Click Search box {click_search}")
 
-            await self.page.keyboard.type(self.name, delay=100)
+            await self.page.keyboard.type(self.name, delay=self.pacer.keystroke_delay())
             # await self.page.get_by_placeholder("Search", exact=True).fill(self.name)
-            await asyncio.sleep(short_delay)
+            await self.pacer.wait("think")
 
             self.logger.info(f"Search box filled with company name {self.name}")
+            await self.pacer.wait("navigate")
+            started = time.perf_counter()
             await self.page.keyboard.press("Enter")
-            await self.page.wait_for_load_state()
-            await asyncio.sleep(delay)
+            try:
+                await self.page.wait_for_load_state()
+                self.page_loaded("search_results", time.perf_counter() - started)
+            except Exception as e:
+                self.pacer.throttled("search results failed to load")
+                raise e
+            if self.pacer.check_url(self.page.url):
+                raise CheckpointError(f"Search for {self.name} redirected to {self.page.url}")
             self.logger.info(f"Search success for {self.name}")
             return True
 
@@ -77,7 +202,7 @@ class search(Base):
 
                 if filters_bar:
                     # Define URL pattern for verification
-                    url_pattern = "https://www.linkedin.com/search/results/companies/**"
+                    url_pattern = f"{config.BASE_URL}/search/results/companies/**"
 
                     # Candidate selectors in priority order
                     candidate_selectors = [
@@ -89,12 +214,15 @@ class search(Base):
 
                     success = False
 
-                    for candidate in candidate_selectors:
+                    # recent winner first
+                    for candidate in strategies.order("company_filter", candidate_selectors):
+                        started = time.perf_counter()
                         try:
                             # 1. Visibility check
                             is_visible = await check_if_its_visible(self.page, candidate, self.logger)
                             if not is_visible:
                                 self.logger.warning(f"Selector not visible: {candidate} {is_visible}")
+                                self.record_attempt("company_filter", candidate, False, started)
                                 continue
 
                             self.logger.info(f"Attempting filter with selector: {candidate}")
@@ -105,9 +233,11 @@ class search(Base):
                                 self.logger.warning(f"Hover failed for selector: {candidate} {hover_success}")
 
                             # 3. Click interaction
-                            click_success = await click_with_fallback(self.page, candidate)
+                            await self.pacer.wait("click")
+                            click_success = await click_with_fallback(self.page, candidate, self.logger)
                             if not click_success:
                                 self.logger.error(f"Click failed for selector: {candidate} {click_success}")
+                                self.record_attempt("company_filter", candidate, False, started)
                                 continue
 
                             # check and handle alert for dialog on expanding network
@@ -130,7 +260,6 @@ class search(Base):
                             if verified:
                                 self.logger.info(f"Company filter activated successfully with: {candidate}")
                                 success = True
-                                break
                             else:
                                 # Fallback: Check if button state changed
                                 pressed_state = await self.page.evaluate(f"""selector => {{
@@ -141,17 +270,24 @@ class search(Base):
                                 if pressed_state == 'true':
                                     self.logger.info(f"Filter state changed to active: {candidate}")
                                     success = True
-                                    break
+                            self.record_attempt("company_filter", candidate, success, started)
+                            if success:
+                                break
                         except Exception as e:
+                            self.record_attempt("company_filter", candidate, False, started)
                             self.logger.error(f"Filter processing failed for {candidate}: {str(e)}")
 
                     try:
+                        await self.harvest_result_cards()
                         # CLick about first result to visit company
-                        result_click = await select_first_company_result(self.page, "div[data-chameleon-result-urn]", self.logger)
+                        await self.pacer.wait("navigate")
+                        result_click = await select_first_company_result(self.page, RESULT_CARD_SELECTOR, self.logger)
                         # result_click = self.page.locator(
                         #     'ul[role="list"] li >> a[data-test-app-aware-link]').first()
                         # await result_click.click(force=True)
                         self.logger.debug(f"First result click status {result_click}")
+                        if result_click and self.cache:
+                            self.cache.put(self.name, self.page.url)
                         success = True
                     except Exception as e:
                         self.logger.error(f"Result click failed {e}")
@@ -172,7 +308,7 @@ class search(Base):
         """
         # Define URL patterns for verification
         # company_url_pattern = "https://www.linkedin.com/search/results/companies/**"
-        company_url_pattern = "https://www.linkedin.com/company/**"
+        company_url_pattern = f"{config.BASE_URL}/company/**"
 
         about_url_pattern = "**/about/"
 
@@ -197,21 +333,22 @@ class search(Base):
             #     lambda: re.match(r"https://www\.linkedin\.com/company/.*", self.page.url),
             #     timeout=5000
             # )
-            await self.page.wait_for_url(lambda: re.match(r"https://www\.linkedin\.com/company/.*", self.page.url))
+            await self.page.wait_for_url(lambda url: url.startswith(f"{config.BASE_URL}/company/"))
             self.logger.info("Verified company page URL pattern")
-        except TimeoutError:
+        except (TimeoutError, PlaywrightTimeoutError):
             self.logger.error("Not on a company page - aborting About navigation")
 
         # 2. Wait for navigation bar to load using wait_for
         try:
             await check_if_its_visible(self.page, nav_selector, self.logger)
             self.logger.info("Company navigation bar loaded")
-        except TimeoutError:
+        except (TimeoutError, PlaywrightTimeoutError):
             self.logger.error("Navigation bar not found - cannot proceed to About page")
 
         success = False
 
-        for about_selector in about_selectors:
+        for about_selector in strategies.order("about_link", about_selectors):
+            started = time.perf_counter()
             try:
                 self.logger.info(f"Attempting with selector: {about_selector}")
 
@@ -219,6 +356,7 @@ class search(Base):
                 is_visible = await check_if_its_visible(self.page, about_selector, self.logger)
                 if not is_visible:
                     self.logger.warning(f"About link not visible with selector: {about_selector}")
+                    self.record_attempt("about_link", about_selector, False, started)
                     continue
 
                 # 4. Hover interaction
@@ -227,12 +365,16 @@ class search(Base):
                     self.logger.warning(f"Hover failed for selector: {about_selector}")
 
                 # Click interaction
+                await self.pacer.wait("navigate")
                 click_success = await click_with_fallback(self.page, about_selector, self.logger)
                 if not click_success:
                     self.logger.error(f"Click failed for selector: {about_selector}")
+                    self.record_attempt("about_link", about_selector, False, started)
                     continue
 
+                load_started = time.perf_counter()
                 await self.page.wait_for_load_state()
+                self.page_loaded("about", time.perf_counter() - load_started)
                 try:
 
                     check = await check_if_click_successful(self.page, about_selector, company_url_pattern, self.logger)
@@ -248,6 +390,7 @@ class search(Base):
                     #     scrape_about = await self.scrape_company_about()
                     #     if scrape_about:
                     success = True
+                    self.record_attempt("about_link", about_selector, True, started)
                     self.logger.info("----- ---- ----- Scrape successful")
                     return success
 
@@ -279,30 +422,36 @@ class search(Base):
                     #     self.logger.warning(f"About page verification failed for {about_selector} {e}")
 
             except Exception as e:
+                self.record_attempt("about_link", about_selector, False, started)
                 self.logger.error(f"About navigation failed with {about_selector}: {str(e)}")
 
         return success
 
     async def execute(self):
-        if await self.search_name():
+        if await self.open_cached_about():
+            self.logger.info(f"Now on cached About page for {self.name} - scraping company data")
+            return True
+
+        if await self.timed("search_name", self.search_name()):
             self.logger.info(f"Search {self.name} loading")
             company_selector = "section.scaffold-layout-toolbar"
-            apply_filter = await self.company_filter(company_selector)
+            apply_filter = await self.timed("company_filter", self.company_filter(company_selector))
             self.logger.info(f"Apply filter {apply_filter} success")
 
             if apply_filter:
                 self.logger.info(f"Search filter about page in {self.name} success")
-                about_page = await self.company_about()
+                about_page = await self.timed("company_about", self.company_about())
                 self.logger.info(f"Company about page {about_page}")
 
                 try:
                     if about_page:
                         self.logger.info("About page loaded success")
                         self.logger.info("Now on About page - scraping company data")
-                        return
+                        return True
 
                 except Exception as e:
                     self.logger.info(f"About page load error {e}")
 
         await self.page.wait_for_load_state()
         self.logger.info(f"Search and filter success and about page")
+        return False
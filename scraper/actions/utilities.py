@@ -1,6 +1,12 @@
 import re
+import time
 
-from ..logger import setup_logger
+import config
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from ..logger import SAMPLED, setup_logger
+from ..metrics import FALLBACK_SECONDS, SELECTOR_FALLBACKS
+from ..strategies import strategies
 
 # logger = setup_logger("linkedn", "INFO")
 
@@ -21,10 +27,10 @@ async def check_if_click_successful(page, selector, url_pattern, logger):
     # 1. Check network idle state
     try:
         await page.wait_for_load_state("networkidle", timeout=5000)
-        logger.info(f"Network idle check completed for {selector}")
+        logger.debug("Network idle check completed for %s", selector)
         success = True
-    except TimeoutError:
-        logger.warning(f"Network did not reach idle state for {selector}")
+    except (TimeoutError, PlaywrightTimeoutError):
+        logger.warning("Network did not reach idle state for %s", selector, extra=SAMPLED)
 
     # 2. Check URL navigation pattern
     try:
@@ -33,17 +39,17 @@ async def check_if_click_successful(page, selector, url_pattern, logger):
             timeout=5000,
             wait_until="domcontentloaded"
         )
-        logger.info(f"URL pattern match successful: {url_pattern}")
+        logger.debug("URL pattern match successful: %s", url_pattern)
         return True  # Return immediately on URL match
-    except TimeoutError:
-        logger.warning(f"URL did not change to match pattern: {url_pattern}")
+    except (TimeoutError, PlaywrightTimeoutError):
+        logger.warning("URL did not change to match pattern: %s", url_pattern, extra=SAMPLED)
 
     # 3. Verify element state changes (if URL didn't change)
     if not success:
         try:
             # Check if element disappeared or changed state
             if not await page.is_visible(selector):
-                logger.info(f"Element vanished after click: {selector}")
+                logger.debug("Element vanished after click: %s", selector)
                 success = True
             else:
                 # Check for visual/state changes
@@ -53,7 +59,7 @@ async def check_if_click_successful(page, selector, url_pattern, logger):
                 }}""")
 
                 if is_now_disabled:
-                    logger.info(f"Element state changed to disabled: {selector}")
+                    logger.debug("Element state changed to disabled: %s", selector)
                     success = True
 
                 # Check for CSS change indicating success
@@ -67,21 +73,61 @@ async def check_if_click_successful(page, selector, url_pattern, logger):
                 }}""")
 
                 if has_success_style:
-                    logger.info(f"Visual success indicators detected: {selector}")
+                    logger.debug("Visual success indicators detected: %s", selector)
                     success = True
         except Exception as e:
-            logger.error(f"Element state check failed: {str(e)}")
+            logger.warning("Element state check failed: %s", e, extra=SAMPLED)
 
     # 4. Final fallback: Check if URL changed at all
     if not success:
         current_url = page.url
         if current_url != original_url:
-            logger.info(f"URL changed from {original_url} to {current_url}")
+            logger.debug("URL changed from %s to %s", original_url, current_url)
             success = True
 
     return success
 
 
+async def visible_is_visible(page, selector):
+    return await page.locator(selector).is_visible()
+
+
+async def visible_css(page, selector):
+    return await page.locator(selector).evaluate("""
+        el => {
+            const style = window.getComputedStyle(el);
+            return style.visibility !== 'hidden' && 
+                   style.display !== 'none' &&
+                   el.offsetWidth > 0 &&
+                   el.offsetHeight > 0;
+        }
+    """)
+
+
+async def visible_bounding_box(page, selector):
+    bounding_box = await page.locator(selector).bounding_box()
+    return bool(bounding_box and bounding_box['width'] > 0 and bounding_box['height'] > 0)
+
+
+async def visible_wait(page, selector):
+    await page.wait_for_selector(selector, state="visible", timeout=3000)
+    return True
+
+
+async def visible_element_handle(page, selector):
+    return bool(await page.locator(selector).element_handle())
+
+
+# (name, log label, method) tried in this order: cheapest checks before the waiting one
+VISIBLE_METHODS = [
+    ("is_visible", "is_visible() check", visible_is_visible),
+    ("css", "CSS visibility check", visible_css),
+    ("bounding_box", "Bounding box check", visible_bounding_box),
+    ("wait", "Wait-based verification", visible_wait),
+    ("element_handle", "Element handle check", visible_element_handle),
+]
+
+
 async def check_if_its_visible(page, selector, logger):
     """
     Checks if a selector is visible using multiple methods.
@@ -90,58 +136,157 @@ async def check_if_its_visible(page, selector, logger):
     :param selector: Element selector
     :return: Boolean
     """
-    # Method 1: Using is_visible()
-    try:
-        if await page.locator(selector).is_visible():
-            logger.info(f"is_visible() confirmed visibility for: {selector}")
-            return True
-    except Exception as e:
-        logger.error(f"is_visible() failed for {selector}: {str(e)}")
-
-    # Method 2: CSS visibility check
-    try:
-        visible = await page.locator(selector).evaluate("""
-            el => {
-                const style = window.getComputedStyle(el);
-                return style.visibility !== 'hidden' && 
-                       style.display !== 'none' &&
-                       el.offsetWidth > 0 &&
-                       el.offsetHeight > 0;
-            }
-        """)
+    for name, label, method in VISIBLE_METHODS:
+        started = time.perf_counter()
+        try:
+            visible = await method(page, selector)
+        except Exception as e:
+            visible = False
+            logger.warning("%s failed for %s: %s", label, selector, e, extra=SAMPLED)
+        outcome = "ok" if visible else "failed"
+        FALLBACK_SECONDS.labels("visible", name, outcome).observe(time.perf_counter() - started)
         if visible:
-            logger.info(f"CSS check confirmed visibility for: {selector}")
+            logger.debug("%s confirmed visibility for: %s", label, selector)
             return True
-    except Exception as e:
-        logger.error(f"CSS visibility check failed for {selector}: {str(e)}")
+        SELECTOR_FALLBACKS.labels("visible").inc()
 
-    # Method 3: Bounding box check
-    try:
-        bounding_box = await page.locator(selector).bounding_box()
-        if bounding_box and bounding_box['width'] > 0 and bounding_box['height'] > 0:
-            logger.info(f"Bounding box confirmed visibility for: {selector}")
-            return True
-    except Exception as e:
-        logger.error(f"Bounding box check failed for {selector}: {str(e)}")
+    logger.warning("All visibility checks failed for: %s", selector)
+    return False
 
-    # Method 4: Wait-based verification
-    try:
-        await page.wait_for_selector(selector, state="visible", timeout=3000)
-        logger.info(f"Wait-based verification succeeded for: {selector}")
-        return True
-    except Exception as e:
-        logger.error(f"Wait-based verification failed for {selector}: {str(e)}")
 
-    # Method 5: Element handle check
-    try:
-        handle = await page.locator(selector).element_handle()
-        if handle:
-            logger.info(f"Element handle confirmed existence for: {selector}")
+async def hover_basic(page, selector):
+    await page.locator(selector).hover()
+    return True
+
+
+async def hover_mouse_move(page, selector):
+    box = await page.locator(selector).bounding_box()
+    if not box:
+        return False
+    await page.mouse.move(
+        box['x'] + box['width'] / 2,
+        box['y'] + box['height'] / 2,
+        steps=20
+    )
+    return True
+
+
+async def hover_dispatch_event(page, selector):
+    await page.dispatch_event(selector, 'mouseover')
+    await page.dispatch_event(selector, 'mousemove')
+    return True
+
+
+async def hover_javascript(page, selector):
+    await page.evaluate(f"""selector => {{
+        const element = document.querySelector(selector);
+        if (element) {{
+            const mouseOverEvent = new MouseEvent('mouseover', {{
+                'view': window,
+                'bubbles': true,
+                'cancelable': true
+            }});
+            element.dispatchEvent(mouseOverEvent);
+
+            const mouseMoveEvent = new MouseEvent('mousemove', {{
+                'view': window,
+                'bubbles': true,
+                'cancelable': true
+            }});
+            element.dispatchEvent(mouseMoveEvent);
+        }}
+    }}""", selector)
+    return True
+
+
+# (name, log label, method) in default priority order
+HOVER_METHODS = [
+    ("basic", "Basic hover", hover_basic),
+    ("mouse_move", "Precise mouse movement hover", hover_mouse_move),
+    ("dispatch_event", "Event dispatch hover", hover_dispatch_event),
+    ("javascript", "JavaScript simulation hover", hover_javascript),
+]
+
+
+async def click_basic(page, selector):
+    await page.locator(selector).click()
+    return True
+
+
+async def click_force(page, selector):
+    # bypass visibility checks
+    await page.locator(selector).click(force=True)
+    return True
+
+
+async def click_position(page, selector):
+    box = await page.locator(selector).bounding_box()
+    if not box:
+        return False
+    await page.mouse.click(
+        box['x'] + box['width'] / 2,
+        box['y'] + box['height'] / 2,
+        delay=100  # More human-like
+    )
+    return True
+
+
+async def click_javascript(page, selector):
+    await page.evaluate(f"""selector => {{
+        const element = document.querySelector(selector);
+        if (element) {{
+            element.click();
+        }}
+    }}""", selector)
+    return True
+
+
+async def click_double(page, selector):
+    await page.locator(selector).dblclick()
+    return True
+
+
+async def click_enter_key(page, selector):
+    await page.locator(selector).focus()
+    await page.keyboard.press("Enter")
+    return True
+
+
+CLICK_METHODS = [
+    ("basic", "Method 1: Basic click", click_basic),
+    ("force", "Method 2: Force click", click_force),
+    ("position", "Method 3: Position-based click", click_position),
+    ("javascript", "Method 4: JavaScript click", click_javascript),
+    ("double_click", "Method 5: Double-click", click_double),
+    ("enter_key", "Method 6: Enter key press", click_enter_key),
+]
+
+
+async def run_with_fallback(page, selector, logger, action, methods):
+    """
+    Tries each method until one succeeds, starting with the method that has
+    worked best for this action and selector lately, and records the outcome.
+    """
+    group = f"{action}:{selector}"
+    for name, label, method in strategies.order(group, methods, key=lambda entry: entry[0]):
+        started = time.perf_counter()
+        try:
+            ok = await method(page, selector)
+            if ok:
+                logger.debug("%s succeeded", label)
+            else:
+                logger.warning("%s: no bounding box", label, extra=SAMPLED)
+        except Exception as e:
+            ok = False
+            logger.warning("%s failed - %s", label, e, extra=SAMPLED)
+        seconds = time.perf_counter() - started
+        strategies.record(group, name, ok, seconds)
+        FALLBACK_SECONDS.labels(action, name, "ok" if ok else "failed").observe(seconds)
+        if ok:
             return True
-    except Exception as e:
-        logger.error(f"Element handle check failed for {selector}: {str(e)}")
+        SELECTOR_FALLBACKS.labels(action).inc()
 
-    logger.warning(f"All visibility checks failed for: {selector}")
+    logger.warning("All %s methods failed for %s", action, selector)
     return False
 
 
@@ -150,66 +295,7 @@ async def hover_with_fallback(page, selector, logger):
     Attempts to hover on an element using multiple methods.
     Returns True as soon as one hover method succeeds.
     """
-    # Method 1: Basic Playwright hover
-    try:
-        await page.locator(selector).hover()
-        logger.info("Basic hover succeeded")
-        return True
-    except Exception as e:
-        logger.error(f"Basic hover failed: {str(e)}")
-
-    # Method 2: Precise mouse movement
-    try:
-        box = await page.locator(selector).bounding_box()
-        if box:
-            await page.mouse.move(
-                box['x'] + box['width'] / 2,
-                box['y'] + box['height'] / 2,
-                steps=20
-            )
-            logger.info("Precise mouse movement hover succeeded")
-            return True
-        else:
-            logger.warning("No bounding box for precise mouse movement")
-    except Exception as e:
-        logger.error(f"Precise mouse movement hover failed: {str(e)}")
-
-    # Method 3: Event dispatching
-    try:
-        await page.dispatch_event(selector, 'mouseover')
-        await page.dispatch_event(selector, 'mousemove')
-        logger.info("Event dispatch hover succeeded")
-        return True
-    except Exception as e:
-        logger.error(f"Event dispatch hover failed: {str(e)}")
-
-    # Method 4: JavaScript-based hover simulation
-    try:
-        await page.evaluate(f"""selector => {{
-            const element = document.querySelector(selector);
-            if (element) {{
-                const mouseOverEvent = new MouseEvent('mouseover', {{
-                    'view': window,
-                    'bubbles': true,
-                    'cancelable': true
-                }});
-                element.dispatchEvent(mouseOverEvent);
-
-                const mouseMoveEvent = new MouseEvent('mousemove', {{
-                    'view': window,
-                    'bubbles': true,
-                    'cancelable': true
-                }});
-                element.dispatchEvent(mouseMoveEvent);
-            }}
-        }}""", selector)
-        logger.info("JavaScript simulation hover succeeded")
-        return True
-    except Exception as e:
-        logger.error(f"JavaScript simulation hover failed: {str(e)}")
-
-    logger.warning("All hover methods failed")
-    return False
+    return await run_with_fallback(page, selector, logger, "hover", HOVER_METHODS)
 
 
 async def click_with_fallback(page, selector, logger):
@@ -217,71 +303,7 @@ async def click_with_fallback(page, selector, logger):
     Attempts to click an element using multiple methods.
     Returns True as soon as one click method succeeds.
     """
-    # Method 1: Basic Playwright click
-    try:
-        await page.locator(selector).click()
-        logger.info("Method 1: Basic click succeeded")
-        return True
-    except Exception as e:
-        logger.error(f"Method 1: Basic click failed - {str(e)}")
-
-    # Method 2: Force click (bypass visibility checks)
-    try:
-        await page.locator(selector).click(force=True)
-        logger.info("Method 2: Force click succeeded")
-        return True
-    except Exception as e:
-        logger.error(f"Method 2: Force click failed - {str(e)}")
-
-    # Method 3: Position-based click
-    try:
-        box = await page.locator(selector).bounding_box()
-        if box:
-            await page.mouse.click(
-                box['x'] + box['width'] / 2,
-                box['y'] + box['height'] / 2,
-                steps=20,
-                delay=100  # More human-like
-            )
-            logger.info("Method 3: Position-based click succeeded")
-            return True
-        else:
-            logger.warning("Method 3: No bounding box for position-based click")
-    except Exception as e:
-        logger.error(f"Method 3: Position-based click failed - {str(e)}")
-
-    # Method 4: JavaScript click simulation
-    try:
-        await page.evaluate(f"""selector => {{
-            const element = document.querySelector(selector);
-            if (element) {{
-                element.click();
-            }}
-        }}""", selector)
-        logger.info("Method 4: JavaScript click succeeded")
-        return True
-    except Exception as e:
-        logger.error(f"Method 4: JavaScript click failed - {str(e)}")
-
-    # Method 5: Double-click fallback
-    try:
-        await page.locator(selector).dblclick()
-        logger.info("Method 5: Double-click succeeded")
-        return True
-    except Exception as e:
-        logger.error(f"Method 5: Double-click failed - {str(e)}")
-
-    # Method 6: Enter key simulation
-    try:
-        await page.locator(selector).focus()
-        await page.keyboard.press("Enter")
-        logger.info("Method 6: Enter key press succeeded")
-        return True
-    except Exception as e:
-        logger.error(f"Method 6: Enter key press failed - {str(e)}")
-
-    logger.warning("All click methods failed")
-    return False
+    return await run_with_fallback(page, selector, logger, "click", CLICK_METHODS)
 
 
 # authenticate
@@ -342,12 +364,12 @@ async def select_first_company_result(page, selector, logger):
         # Wait for navigation to company page
         try:
             await page.wait_for_url(
-                "https://www.linkedin.com/company/**",
+                f"{config.BASE_URL}/company/**",
                 timeout=10000,
                 wait_until="domcontentloaded"
             )
             return True
-        except TimeoutError:
+        except (TimeoutError, PlaywrightTimeoutError):
             logger.warning("Navigation to company page timed out")
             return False
     return False
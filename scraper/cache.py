@@ -0,0 +1,141 @@
+"""
+    Persistent company name -> LinkedIn company URL resolution cache
+"""
+import asyncio
+import json
+import os
+import re
+import time
+import unicodedata
+from pathlib import Path
+
+parent_dir = Path(__name__).resolve().parent  # Get the parent directory of the current directory
+cache_filepath = parent_dir / 'scraper' / 'resolution_cache.json'
+
+COMPANY_URL = re.compile(r"^(https?://[^/]+/company/[^/?#]+/?)")
+
+
+def normalize_name(name: str) -> str:
+    """Case, accent and punctuation insensitive key for a company name"""
+    name = unicodedata.normalize("NFKC", name or "").casefold()
+    return re.sub(r"[\W_]+", " ", name).strip()
+
+
+def company_root(url: str):
+    """Reduce any company sub-page URL to its `/company/<slug>/` root, or None"""
+    match = COMPANY_URL.match(url or "")
+    if not match:
+        return None
+    root = match.group(1)
+    return root if root.endswith("/") else root + "/"
+
+
+class ResolutionCache:
+    """
+        Remembers which company page a searched name resolved to, so repeat
+        runs can open `<company url>/about/` directly instead of going through
+        the search box, the Companies filter and the first result.
+
+        Changes only mark the cache dirty; `flush()` writes it from a thread,
+        at most every `save_interval` seconds unless forced.
+    """
+
+    def __init__(self, path=cache_filepath, ttl: float = 30 * 24 * 3600, logger=None, save_interval: float = 30.0):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.logger = logger
+        self.save_interval = save_interval
+        self.entries = {}
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        self.lock = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Resolution cache unreadable, starting empty: {e}")
+            self.entries = {}
+
+    def save(self, entries=None):
+        """Write the cache atomically so a crash never leaves half a file behind"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries if entries is None else entries, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    async def flush(self, force: bool = False):
+        """Save pending changes off the event loop, once `save_interval` has passed since the last save"""
+        if not self.dirty or (not force and time.monotonic() - self.saved_at < self.save_interval):
+            return
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            if not self.dirty:
+                return
+            # entries are replaced, never mutated in place, so a shallow copy is a stable snapshot
+            entries, self.dirty = dict(self.entries), False
+            try:
+                await asyncio.to_thread(self.save, entries)
+            except Exception as e:
+                self.dirty = True
+                if self.logger:
+                    self.logger.error(f"Resolution cache not saved: {e}")
+            self.saved_at = time.monotonic()
+
+    def get(self, name: str):
+        """Return the cached company URL for a name, or None when missing or expired"""
+        entry = self.entries.get(normalize_name(name))
+        if not entry:
+            return None
+        if time.time() - entry.get("resolved_at", 0) > self.ttl:
+            return None
+        return entry.get("url")
+
+    def put(self, name: str, url: str):
+        """Store the company page a name resolved to; non-company URLs are ignored"""
+        root = company_root(url)
+        if not root:
+            return False
+        self.entries[normalize_name(name)] = {"name": name, "url": root, "resolved_at": time.time()}
+        self.dirty = True
+        if self.logger:
+            self.logger.info(f"Resolution cached {name} -> {root}")
+        return True
+
+    def put_many(self, cards):
+        """
+        Store the companies listed on a search results page, keyed by their
+        display name, with the card's snippets. Names already resolved (and
+        not expired) keep their entry.
+        """
+        added = 0
+        now = time.time()
+        for card in cards:
+            key = normalize_name(card.get("name"))
+            root = company_root(card.get("url"))
+            if not key or not root or self.get(card["name"]):
+                continue
+            self.entries[key] = dict(card, url=root, resolved_at=now, source="search_results")
+            added += 1
+        if added:
+            self.dirty = True
+            if self.logger:
+                self.logger.info(f"Resolution cache harvested {added} companies from search results")
+        return added
+
+    def invalidate(self, name: str):
+        if self.entries.pop(normalize_name(name), None) is not None:
+            self.dirty = True
+            if self.logger:
+                self.logger.info(f"Resolution cache invalidated for {name}")
+
+    def clear(self):
+        self.entries = {}
+        self.save()
@@ -0,0 +1,230 @@
+"""
+    Long-lived scraper: one warm, signed-in browser serving jobs over a local socket
+
+    python -m scraper.daemon serve [--workers 3]
+    python -m scraper.daemon submit --companies batch.json [--workers 2] [--resume] [--posts]
+    python -m scraper.daemon status
+    python -m scraper.daemon stop
+
+    Requests and responses are single JSON lines:
+    {"action": "scrape", "companies": [{"name": ...}], "workers": 2, "resume": false, "posts": false}
+    {"action": "status"} / {"action": "shutdown"}
+"""
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+import config
+from models import CompanyRecord
+from .inputs import CompanyReader
+from .jobstate import DONE, UNCHANGED, JobStore
+from .logger import setup_logger
+from .main import launch, logger, open_sessions, scrape_companies, serve_metrics
+from .sinks import JsonlResultWriter
+
+
+class CollectingWriter(JsonlResultWriter):
+    """Results writer that also keeps the job's records to send back to the client"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record.to_dict() if isinstance(record, CompanyRecord) else record)
+        super().write(record)
+
+
+def socket_path() -> Path:
+    return Path(__name__).resolve().parent / config.DAEMON_SOCKET
+
+
+async def open_connection():
+    """Connect to the daemon: unix socket where available, else localhost TCP"""
+    if hasattr(socket, "AF_UNIX"):
+        return await asyncio.open_unix_connection(str(socket_path()), limit=config.DAEMON_MAX_REQUEST)
+    return await asyncio.open_connection("127.0.0.1", config.DAEMON_PORT, limit=config.DAEMON_MAX_REQUEST)
+
+
+class ScraperDaemon:
+    """
+        Keeps Firefox and the signed-in sessions open between jobs so a batch
+        only pays for its own pages. Jobs run one at a time, in arrival order,
+        each with up to `workers` pages.
+
+        The daemon keeps its own job table (`daemon_jobs`), so a batch never
+        resets the checkpoint of a main run, and one parse pool for its
+        whole lifetime instead of spawning processes for every batch.
+    """
+
+    def __init__(self, workers: int = config.WORKERS):
+        self.workers = workers
+        self.sessions = None
+        self.blocker = None
+        self.jobs = None
+        self.parse_pool = None
+        self.server = None
+        self.lock = asyncio.Lock()
+        self.stopping = asyncio.Event()
+        self.started = time.monotonic()
+        self.jobs_done = 0
+        self.waiting = 0
+
+    async def scrape(self, request: dict) -> dict:
+        companies = [company if isinstance(company, dict) else {"name": company}
+                     for company in request.get("companies", [])]
+        workers = int(request.get("workers") or self.workers)
+        self.waiting += 1
+        async with self.lock:
+            self.waiting -= 1
+            sink = CollectingWriter(batch_size=config.RESULTS_BATCH_SIZE,
+                                    flush_interval=config.RESULTS_FLUSH_INTERVAL, logger=logger)
+            started = time.perf_counter()
+            stats = await scrape_companies(self.sessions, companies, workers=workers,
+                                           resume=bool(request.get("resume")), blocker=self.blocker, sink=sink,
+                                           posts=bool(request.get("posts", config.SCRAPE_POSTS)),
+                                           jobs=self.jobs, parse_pool=self.parse_pool)
+            self.jobs_done += 1
+            # unchanged About pages are not parsed again, so they have no record: name them instead
+            unchanged = [company["name"] for company in companies
+                         if self.jobs.outcome(company["name"]) == (DONE, UNCHANGED)]
+        return {
+            "ok": True,
+            "companies": len(companies),
+            "done": sum(worker.done for worker in stats),
+            "failed": sum(worker.failed for worker in stats),
+            "seconds": round(time.perf_counter() - started, 2),
+            "records": sink.records,
+            "unchanged": unchanged,
+        }
+
+    def status(self) -> dict:
+        return {
+            "ok": True,
+            "uptime_seconds": round(time.monotonic() - self.started),
+            "jobs_done": self.jobs_done,
+            "busy": self.lock.locked(),
+            "waiting": self.waiting,
+            "sessions": self.sessions.stats(),
+        }
+
+    async def handle(self, reader, writer):
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line)
+                action = request.get("action")
+                if action == "scrape":
+                    response = await self.scrape(request)
+                elif action == "status":
+                    response = self.status()
+                elif action == "shutdown":
+                    self.stopping.set()
+                    response = {"ok": True}
+                else:
+                    response = {"ok": False, "error": f"Unknown action {action!r}"}
+            except Exception as e:
+                logger.error(f"Daemon request failed: {e}")
+                response = {"ok": False, "error": str(e)}
+            writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start_server(self):
+        if hasattr(socket, "AF_UNIX"):
+            path = socket_path()
+            path.unlink(missing_ok=True)
+            self.server = await asyncio.start_unix_server(self.handle, str(path), limit=config.DAEMON_MAX_REQUEST)
+            return str(path)
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", config.DAEMON_PORT,
+                                                 limit=config.DAEMON_MAX_REQUEST)
+        return f"127.0.0.1:{config.DAEMON_PORT}"
+
+    async def serve(self):
+        setup_logger("linkedn", "INFO")
+        async with async_playwright() as p:
+            browser, open_context, self.blocker = await launch(p)
+            self.sessions = await open_sessions(open_context, self.workers)
+            self.jobs = JobStore(table="daemon_jobs")
+            if config.PARSE_PROCESSES > 0:
+                from scraper.parsing import ParsePool
+
+                self.parse_pool = ParsePool(None, logger, processes=config.PARSE_PROCESSES,
+                                            max_pending=config.PARSE_QUEUE_SIZE)
+                await self.parse_pool.start()
+            serve_metrics()
+            address = await self.start_server()
+            logger.info(f"Scraper daemon ready on {address}")
+            print(f"Scraper daemon ready on {address}")
+            try:
+                await self.stopping.wait()
+            finally:
+                self.server.close()
+                await self.server.wait_closed()
+                if hasattr(socket, "AF_UNIX"):
+                    socket_path().unlink(missing_ok=True)
+                # let a running job finish before the browser goes away
+                async with self.lock:
+                    if self.parse_pool is not None:
+                        await self.parse_pool.stop()
+                    self.jobs.close()
+                    await self.sessions.close()
+                    await browser.close()
+            logger.info("Scraper daemon stopped")
+
+
+async def request(payload: dict) -> dict:
+    """Send one request to the running daemon and return its response"""
+    reader, writer = await open_connection()
+    try:
+        writer.write((json.dumps(payload) + "\n").encode("utf-8"))
+        await writer.drain()
+        line = await reader.readline()
+        return json.loads(line)
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("serve", "submit", "status", "stop"))
+    parser.add_argument("--companies", help="JSON, JSON Lines or CSV file of companies to scrape (submit)")
+    parser.add_argument("--workers", type=int, default=None, help="pages per job (serve: default for every job)")
+    parser.add_argument("--resume", action="store_true", help="skip companies already done (submit)")
+    parser.add_argument("--posts", action="store_true", help="also scrape the Posts feeds (submit)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        asyncio.run(ScraperDaemon(workers=args.workers or config.WORKERS).serve())
+        return
+
+    if args.command == "submit":
+        if not args.companies:
+            parser.error("submit needs --companies")
+        companies = list(CompanyReader(args.companies))
+        payload = {"action": "scrape", "companies": companies, "workers": args.workers, "resume": args.resume,
+                   "posts": args.posts}
+    elif args.command == "status":
+        payload = {"action": "status"}
+    else:
+        payload = {"action": "shutdown"}
+
+    try:
+        response = asyncio.run(request(payload))
+    except (FileNotFoundError, ConnectionError) as e:
+        print(f"Scraper daemon not reachable: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(response, indent=2, ensure_ascii=False))
+    if not response.get("ok"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
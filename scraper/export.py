@@ -0,0 +1,109 @@
+"""
+    Columnar export of the scraped company results: Parquet when pyarrow is installed, else CSV
+
+    python -m scraper.export [--input FILE ...] [--out scraper/results/companies] [--format parquet|csv]
+
+    Reads the JSON Lines results (and the older concatenated companies_about.json)
+    in chunks, keeps the latest record per company URL and writes typed columns.
+"""
+import argparse
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+from schema import LEGACY_KEYS, SCHEMA, parse_company_size, parse_founding_year
+from .cache import company_root
+from .sinks import iter_concatenated, legacy_results_filepath, results_filepath
+
+parent_dir = Path(__name__).resolve().parent  # Get the parent directory of the current directory
+export_filepath = parent_dir / 'scraper' / 'results' / 'companies'
+
+COLUMNS = list(SCHEMA)
+DTYPES = {name: "Int64" if field.type is int else "string" for name, field in SCHEMA.items()}
+
+
+def read_chunks(path, chunksize: int):
+    """DataFrames of at most `chunksize` records from a results file"""
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        with pd.read_json(path, lines=True, chunksize=chunksize, dtype=False, convert_dates=False) as reader:
+            yield from reader
+    else:
+        for records in iter_concatenated(path, chunksize):
+            yield pd.DataFrame.from_records(records)
+
+
+def normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Current column names and order, numeric fields filled in and a company key to de-duplicate on"""
+    # a file may hold both spellings of a column: keep the current one, filled from the legacy one
+    for legacy, name in LEGACY_KEYS.items():
+        if legacy in frame.columns:
+            frame[name] = frame[name].combine_first(frame[legacy]) if name in frame.columns else frame[legacy]
+    frame = frame.reindex(columns=COLUMNS)
+
+    sizes = frame["source_company_size"].fillna("").astype(str)
+    missing = frame["source_company_size_min"].isna() & (sizes != "")
+    if missing.any():
+        parsed = sizes[missing].map(parse_company_size)
+        frame.loc[missing, "source_company_size_min"] = parsed.map(lambda size: size[0])
+        frame.loc[missing, "source_company_size_max"] = parsed.map(lambda size: size[1])
+    founded = frame["source_founding_date"].fillna("").astype(str)
+    missing = frame["source_founding_year"].isna() & (founded != "")
+    if missing.any():
+        frame.loc[missing, "source_founding_year"] = founded[missing].map(parse_founding_year)
+
+    urls = frame["source_company_url"].fillna("").astype(str)
+    frame["company_key"] = urls.map(lambda url: company_root(url) or url)
+    return frame[frame["company_key"] != ""]
+
+
+def load_results(inputs, chunksize: int = 50000, logger=None) -> pd.DataFrame:
+    """All records of the input files, the latest one per company"""
+    chunks = []
+    for path in inputs:
+        for chunk in read_chunks(path, chunksize):
+            # drop repeats early so the concatenation stays small
+            chunks.append(normalize(chunk).drop_duplicates("company_key", keep="last"))
+        if logger:
+            logger.info(f"Read {path}")
+    if not chunks:
+        return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in DTYPES.items()})
+
+    frame = pd.concat(chunks, ignore_index=True).drop_duplicates("company_key", keep="last")
+    return frame.drop(columns="company_key").astype(DTYPES).reset_index(drop=True)
+
+
+def export(inputs=None, out=export_filepath, fmt: str = None, chunksize: int = 50000, logger=None) -> Path:
+    """Write the de-duplicated results as Parquet (pyarrow installed) or CSV; returns the file written"""
+    if inputs is None:
+        inputs = [path for path in (legacy_results_filepath, results_filepath) if path.exists()]
+    if fmt is None:
+        fmt = "parquet" if importlib.util.find_spec("pyarrow") else "csv"
+
+    frame = load_results(inputs, chunksize, logger)
+    out = Path(out).with_suffix(f".{fmt}")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        frame.to_parquet(out, index=False)
+    else:
+        frame.to_csv(out, index=False)
+    if logger:
+        logger.info(f"Exported {len(frame)} companies to {out}")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", nargs="*", help="results files (default: the JSON Lines and legacy JSON results)")
+    parser.add_argument("--out", default=str(export_filepath), help="output path, the extension follows the format")
+    parser.add_argument("--format", choices=("parquet", "csv"), help="default: parquet when pyarrow is installed")
+    parser.add_argument("--chunksize", type=int, default=50000, help="records read at a time")
+    args = parser.parse_args()
+
+    out = export(args.input, args.out, args.format, args.chunksize)
+    print(f"Exported to {out}")
+
+
+if __name__ == "__main__":
+    main()
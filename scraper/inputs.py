@@ -0,0 +1,156 @@
+"""
+    Streaming reader for the list of companies to scrape: JSON array, JSON Lines or CSV
+"""
+import csv
+import functools
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import config
+from .cache import company_root, normalize_name
+
+SEPARATORS = re.compile(r"[\s,]*")
+SLUG = re.compile(r"^[\w.%-]+$", re.UNICODE)
+
+# accepted column / key names, first match wins
+NAME_KEYS = ("name", "company", "company_name", "source_company_name")
+URL_KEYS = ("url", "linkedin", "linkedin_url", "company_url", "source_company_url")
+SLUG_KEYS = ("slug", "linkedin_slug")
+
+
+def iter_json_array(path, block_size: int = 1 << 16):
+    """Items of a top-level JSON array, decoded one at a time instead of loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(block_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} is not a JSON array")
+        position, eof = 1, False
+        while True:
+            position = SEPARATORS.match(buffer, position).end()
+            if buffer.startswith("]", position):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # item cut off at the end of the block: keep its start, read on
+                block = f.read(block_size)
+                eof = not block
+                buffer, position = buffer[position:] + block, 0
+                continue
+            yield item
+            position = end
+
+
+def iter_rows(path):
+    """Raw rows (dicts) of a companies file, by extension: .json, .jsonl/.ndjson or .csv"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif suffix == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+    else:
+        yield from iter_json_array(path)
+
+
+@functools.lru_cache(maxsize=256)
+def column(key) -> str:
+    """Canonical column name: "LinkedIn URL" and "linkedin_url" are the same column"""
+    return re.sub(r"\W+", "_", str(key).strip().lower())
+
+
+def first(row: dict, keys) -> str:
+    for key in keys:
+        value = row.get(key)
+        if value:
+            return str(value).strip()
+    return ""
+
+
+def company_url(row: dict):
+    """
+    Company page root from a URL or slug column, None when the row has
+    neither (or a bad one). Only the slug is taken from a URL: the page is
+    always rebuilt on `config.BASE_URL`, whatever host or scheme the row used.
+    """
+    url = first(row, URL_KEYS)
+    root = company_root(url if "://" in url else f"https://{url}") if url else None
+    # a URL column holding something else than a company page falls back to the slug column
+    slug = root.rstrip("/").rsplit("/", 1)[-1] if root else first(row, SLUG_KEYS).strip("/")
+    if slug and SLUG.match(slug):
+        return f"{config.BASE_URL}/company/{slug}/"
+    return None
+
+
+def fingerprint(key: str) -> int:
+    """8-byte hash of a dedupe key: a small int in the seen-set instead of the whole string"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class CompanyReader:
+    """
+        Iterates the companies of an input file lazily, so the work queue is fed
+        while the file is still being read.
+
+        Rows become `{"name", "url", ...}` dicts (other columns are kept, `url`
+        is the company page root or None), with whitespace collapsed in the name.
+        A row is a duplicate when its company page or its normalized name was
+        already read, whichever order the rows come in. The seen-set keeps only 8-byte
+        hashes of those keys, so it stays small for lists of any length.
+    """
+
+    def __init__(self, path, logger=None):
+        self.path = Path(path)
+        self.logger = logger
+        self.seen = set()
+        self.read = 0
+        self.yielded = 0
+        self.duplicates = 0
+        self.invalid = 0
+
+    def normalize(self, row):
+        if isinstance(row, str):
+            row = {"name": row}
+        if not isinstance(row, dict):
+            return None
+        row = {column(key): value for key, value in row.items() if key is not None}
+        url = company_url(row)
+        name = " ".join(first(row, NAME_KEYS).split())
+        if not name and url:
+            name = url.rstrip("/").rsplit("/", 1)[-1]
+        if not name:
+            return None
+        row["name"] = name
+        row["url"] = url
+        return row
+
+    def __iter__(self):
+        for row in iter_rows(self.path):
+            self.read += 1
+            company = self.normalize(row)
+            if company is None:
+                self.invalid += 1
+                continue
+            name_key = fingerprint(normalize_name(company["name"]))
+            key = fingerprint(company["url"]) if company["url"] else name_key
+            if key in self.seen or name_key in self.seen:
+                self.duplicates += 1
+                continue
+            self.seen.add(key)
+            self.seen.add(name_key)
+            self.yielded += 1
+            yield company
+        if self.logger:
+            self.logger.info(f"Read {self.path}: {self.stats()}")
+
+    def stats(self) -> dict:
+        return {"read": self.read, "companies": self.yielded, "duplicates": self.duplicates, "invalid": self.invalid}
@@ -0,0 +1,151 @@
+"""
+    Persistent per-company job state so an interrupted run can be resumed
+"""
+import sqlite3
+import time
+from pathlib import Path
+
+from .cache import normalize_name
+
+parent_dir = Path(__name__).resolve().parent  # Get the parent directory of the current directory
+jobs_filepath = parent_dir / 'scraper' / 'jobs.sqlite3'
+
+PENDING = "pending"
+IN_PROGRESS = "in-progress"
+DONE = "done"
+FAILED = "failed"
+
+# outcome of a done job: the About page changed since the last run or not
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+
+class JobStore:
+    """
+        SQLite table of companies with their status (pending, in-progress,
+        done, failed), attempt count, last error and timestamps. Every update
+        is committed immediately, so the state survives a crash mid-run.
+
+        A second table keeps each company's About page fingerprint; it is not
+        cleared by `reset()` so the next run can tell unchanged pages apart.
+        Job tables other than `jobs` (the daemon's) share those fingerprints
+        without touching the checkpoint of a main run.
+    """
+
+    def __init__(self, path=jobs_filepath, table: str = "jobs"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid job table name {table!r}")
+        self.table = table
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        columns = [row[1] for row in self.db.execute(f"PRAGMA table_info({self.table})")]
+        if "outcome" not in columns:
+            self.db.execute(f"ALTER TABLE {self.table} ADD COLUMN outcome TEXT")
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS fingerprints (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                changed_at REAL NOT NULL,
+                seen_at REAL NOT NULL
+            )"""
+        )
+        self.db.commit()
+
+    def reset(self):
+        """Forget every job, used when a run starts over instead of resuming"""
+        self.db.execute(f"DELETE FROM {self.table}")
+        self.db.commit()
+
+    def add(self, name: str):
+        now = time.time()
+        self.db.execute(
+            f"INSERT OR IGNORE INTO {self.table} (key, name, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (normalize_name(name), name, PENDING, now, now)
+        )
+        self.db.commit()
+
+    def status(self, name: str):
+        row = self.db.execute(f"SELECT status FROM {self.table} WHERE key = ?", (normalize_name(name),)).fetchone()
+        return row[0] if row else None
+
+    def outcome(self, name: str):
+        """(status, outcome) of a company's job, (None, None) when it has none"""
+        row = self.db.execute(f"SELECT status, outcome FROM {self.table} WHERE key = ?",
+                              (normalize_name(name),)).fetchone()
+        return tuple(row) if row else (None, None)
+
+    def should_run(self, name: str, resume: bool = True) -> bool:
+        """Everything runs on a fresh run; on resume only companies not done yet (pending, failed, interrupted)"""
+        self.add(name)
+        return not resume or self.status(name) != DONE
+
+    def start(self, name: str):
+        now = time.time()
+        self.add(name)
+        self.db.execute(
+            f"UPDATE {self.table} SET status = ?, attempts = attempts + 1, started_at = ?, updated_at = ? "
+            "WHERE key = ?",
+            (IN_PROGRESS, now, now, normalize_name(name))
+        )
+        self.db.commit()
+
+    def finish(self, name: str, outcome: str = None):
+        self.db.execute(
+            f"UPDATE {self.table} SET status = ?, outcome = ?, last_error = NULL, updated_at = ? WHERE key = ?",
+            (DONE, outcome, time.time(), normalize_name(name))
+        )
+        self.db.commit()
+
+    def fail(self, name: str, error=None):
+        self.db.execute(
+            f"UPDATE {self.table} SET status = ?, last_error = ?, updated_at = ? WHERE key = ?",
+            (FAILED, str(error) if error is not None else None, time.time(), normalize_name(name))
+        )
+        self.db.commit()
+
+    def summary(self) -> dict:
+        """Number of companies per status, and of done ones per outcome (changed/unchanged)"""
+        summary = dict(self.db.execute(f"SELECT status, COUNT(*) FROM {self.table} GROUP BY status").fetchall())
+        summary.update(self.db.execute(
+            f"SELECT outcome, COUNT(*) FROM {self.table} WHERE status = ? AND outcome IS NOT NULL GROUP BY outcome",
+            (DONE,)
+        ).fetchall())
+        return summary
+
+    def fingerprint(self, name: str):
+        """About page fingerprint stored by the last run that parsed the company, or None"""
+        row = self.db.execute("SELECT fingerprint FROM fingerprints WHERE key = ?",
+                              (normalize_name(name),)).fetchone()
+        return row[0] if row else None
+
+    def remember_fingerprint(self, name: str, fingerprint: str):
+        now = time.time()
+        self.db.execute(
+            """INSERT INTO fingerprints (key, fingerprint, changed_at, seen_at) VALUES (?, ?, ?, ?)
+               ON CONFLICT(key) DO UPDATE SET fingerprint = excluded.fingerprint,
+               changed_at = excluded.changed_at, seen_at = excluded.seen_at""",
+            (normalize_name(name), fingerprint, now, now)
+        )
+        self.db.commit()
+
+    def mark_seen(self, name: str):
+        """The About page still has its stored fingerprint: only note when it was checked"""
+        self.db.execute("UPDATE fingerprints SET seen_at = ? WHERE key = ?", (time.time(), normalize_name(name)))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
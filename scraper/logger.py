@@ -1,21 +1,140 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
 from pathlib import Path
 
+import config
+
+# pass as `extra=SAMPLED` on repetitive lines (e.g. fallback failures) to log only one in LOG_SAMPLE_EVERY
+SAMPLED = {"sample": True}
+
+_lock = threading.Lock()
+_queue = None
+_listener = None
+_pid = None
+
+
+class SampleFilter(logging.Filter):
+    """
+    Lets through the first record of every (logger, message template, level) marked
+    with `extra=SAMPLED` and then one in `every`, noting how many were skipped.
+    Unmarked records always pass.
+    """
+
+    def __init__(self, every: int = 20):
+        super().__init__()
+        self.every = max(1, int(every))
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if not getattr(record, "sample", False):
+            return True
+        key = (record.name, record.msg, record.levelno)
+        with self.lock:
+            count = self.seen.get(key, 0)
+            self.seen[key] = count + 1
+        if count % self.every:
+            return False
+        if count:
+            record.msg = f"{record.msg} ({self.every - 1} similar suppressed)"
+        return True
+
+
+def file_handler(log_file) -> logging.Handler:
+    """Rotating file handler: by time when LOG_ROTATE_WHEN is set, else by size"""
+    if config.LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(log_file, when=config.LOG_ROTATE_WHEN,
+                                                            backupCount=config.LOG_BACKUP_COUNT, encoding="utf-8")
+    else:
+        handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=config.LOG_MAX_BYTES,
+                                                       backupCount=config.LOG_BACKUP_COUNT, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("DEBUG: %(asctime)s %(levelname)s: %(message)s"))
+    return handler
+
+
+def start_listener() -> queue.SimpleQueue:
+    """
+    Start this process's single writer thread (once) and return the queue
+    loggers hand their records to, so no file I/O happens on the event loop.
+    """
+    global _queue, _listener, _pid
+    with _lock:
+        if _listener is not None and _pid == os.getpid():
+            return _queue
+        base_folder = Path(__name__).resolve().parent
+        log_file = base_folder / config.LOG_FILE
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+
+        _queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(_queue, file_handler(log_file), respect_handler_level=True)
+        _listener.start()
+        _pid = os.getpid()
+        atexit.register(stop_listener)
+        return _queue
+
+
+def stop_listener():
+    """Write out whatever is still queued and stop the writer thread"""
+    global _listener
+    with _lock:
+        if _listener is not None and _pid == os.getpid():
+            _listener.stop()
+        _listener = None
+
 
 def setup_logger(name: str, level: str) -> logging.Logger:
     """
     Configures and returns a logger that prefixes messages with DEBUG:
-    and includes timestamps.
+    and includes timestamps. Safe to call repeatedly: the queue handler
+    is only attached once per logger.
     """
-    base_folder = Path(__name__).resolve().parent
-    log_file = f'{base_folder}/scraper/scraper.log'
+    log_queue = start_listener()
 
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    fmt = logging.Formatter("DEBUG: %(asctime)s %(levelname)s: %(message)s")
-    handler = logging.FileHandler(log_file)
-    handler.setFormatter(fmt)
+    for handler in logger.handlers:
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is log_queue:
+            return logger
+    for handler in list(logger.handlers):
+        # left over from before a fork: its queue has no listener in this process
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(SampleFilter(config.LOG_SAMPLE_EVERY))
     logger.addHandler(handler)
     return logger
+
+
+class ReplayHandler(logging.Handler):
+    """Hands records logged in a child process to the logger of the same name in this one"""
+
+    def handle(self, record):
+        logging.getLogger(record.name).handle(record)
+        return True
+
+
+def start_child_listener(mp_context):
+    """
+    Queue for the records of pool child processes and the listener replaying
+    them through this process's loggers, so children never open the log file
+    """
+    log_queue = mp_context.Queue()
+    listener = logging.handlers.QueueListener(log_queue, ReplayHandler())
+    listener.start()
+    return log_queue, listener
+
+
+def init_child_logging(log_queue, level: int = logging.INFO):
+    """Process pool initializer: every record of the child goes to the parent through `log_queue`"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
@@ -1,40 +1,136 @@
 from scraper.actions.base import linkednController
+import argparse
 import asyncio
-import json
-import random
-import pandas as pd
+import logging
+import time
 from pathlib import Path
 from .logger import setup_logger
+from .workers import WorkerPool, final_stats
+from .cache import ResolutionCache
+from .inputs import CompanyReader
+from .sinks import JsonlResultWriter, posts_filepath
+from .poststore import SeenPostStore
+from .jobstate import CHANGED, FAILED, IN_PROGRESS, UNCHANGED, JobStore
+from . import metrics
+from .network import ResourceBlocker
+from .sessions import SessionPool
+from .strategies import strategies
+from .timing import step_timer
 from playwright.async_api import Playwright, async_playwright, expect
+import config
+from models import CompanyRecord
+from schema import validate
 
 
-# random delay time using uniform, so it uses floats instead of int to simulate human randomness
-delay = random.uniform(3, 7)
-short_delay = random.uniform(2, 4)
+# handlers are attached by setup_logger() when a run starts, not at import: the spawned
+# parse processes import this module too and must not open the log file themselves
+logger = logging.getLogger("linkedn")
 
-logger = setup_logger("linkedn", "INFO")
 
+async def scrape_company(page, context, company, logger, cache=None, parse_pool=None, sink=None, pacer=None,
+                         last_fingerprint=None):
+    """
+    Search a company on the given page and scrape its About page. With a
+    parse pool the captured page is handed off, parsed on another core and
+    its record awaited before returning.
 
-# load cookies if it exists
-async def load_cookies(context, logger):
+    When the About fragments still match `last_fingerprint` the page is neither
+    captured nor parsed. Returns {"ok", "changed", "fingerprint"}.
+    """
+    from scraper.actions.search import search
+    from scraper.actions.scrape import AboutFingerprint, CompanyAboutScraper, PageSnapshot
+    from scraper.parsing import ParseHandOff
+
+    def changed(upstream):
+        fingerprint = upstream["fingerprint"]
+        return fingerprint is None or fingerprint != last_fingerprint
+
+    # search -> fingerprint -> snapshot -> parse, each step fed by the result of the previous one
+    # page steps get a deadline and a retry; parsing is bounded by the company deadline
+    controller = linkednController(retry_base=config.RETRY_BASE_SECONDS, retry_cap=config.RETRY_MAX_SECONDS)
+    page_step = {"timeout": config.STEP_TIMEOUT, "retries": config.STEP_RETRIES}
+    controller.add_command(search(page, context, name=company["name"], logger=logger, cache=cache,
+                                   pacer=pacer, company_url=company.get("url")), name="search",
+                           accept=bool, **page_step)
+    controller.add_command(AboutFingerprint(page), name="fingerprint", depends_on="search", **page_step)
+    controller.add_command(lambda upstream: PageSnapshot(page) if changed(upstream) else None,
+                           name="snapshot", depends_on="fingerprint", **page_step)
+    if parse_pool is not None:
+        controller.add_command(
+            lambda upstream: ParseHandOff(parse_pool, *upstream["snapshot"],
+                                          key=(company["name"], upstream["fingerprint"]))
+            if upstream["snapshot"] else None,
+            name="scrape", depends_on=("fingerprint", "snapshot")
+        )
+    else:
+        controller.add_command(
+            lambda upstream: CompanyAboutScraper(*upstream["snapshot"], logger=logger, sink=sink)
+            if upstream["snapshot"] else None,
+            name="scrape", depends_on="snapshot"
+        )
+    results = await controller.run()
+    logger.info(f"Command timings for {company['name']}: {controller.timings}")
+    for name, timing in controller.timings.items():
+        step_timer.record(name, timing["seconds"])
+
+    fingerprint = results.get("fingerprint")
+    if results.get("snapshot") is None:
+        logger.info(f"About page of {company['name']} unchanged since the last run")
+        return {"ok": True, "changed": False, "fingerprint": fingerprint}
+    scraped = results.get("scrape")
+    if isinstance(scraped, asyncio.Future):
+        # parsed on another core: the company is not done until its record is known
+        scraped = await scraped
+        logger.info(f"Parsed {company['name']}: {scraped}")
+    if not isinstance(scraped, (dict, CompanyRecord)):
+        return {"ok": bool(scraped), "changed": True, "fingerprint": fingerprint}
+    # a record without its required fields is a failed company, not a result (the inline parser skips it too)
+    problems = validate(scraped, required_only=True)
+    if problems:
+        logger.error(f"Record for {company['name']} failed the required fields: {problems}")
+    elif parse_pool is not None:
+        sink.write(scraped)
+    return {"ok": not problems, "changed": True, "fingerprint": fingerprint}
+
+
+async def scrape_posts(page, company, logger, sink, store=None, pacer=None):
+    """
+    Scrape the Posts feed of a company whose About page is done, under its own
+    deadline: posts are extra, so running out of time only ends the feed early
+    """
+    from scraper.actions.posts import CompanyPostsScraper
+
+    command = CompanyPostsScraper(page, company["name"], logger, sink=sink, store=store, pacer=pacer,
+                                  max_posts=config.POSTS_MAX)
+    started = time.perf_counter()
     try:
-        base_folder = Path(__name__).resolve().parent
-        file_path = base_folder / 'scraper' / 'cookies.json'
-        # load cookies of the user from the file
-        with open(file_path, "r") as f:
-            cookies = json.load(f)
-            await context.add_cookies(cookies)
-            logger.info(f"Cookies loaded for successfully")
-        return True
+        async with command:
+            return await asyncio.wait_for(command.execute(), config.POSTS_TIMEOUT or None)
+    except asyncio.TimeoutError:
+        logger.warning(f"Posts of {company['name']} stopped after {config.POSTS_TIMEOUT:.0f}s")
     except Exception as e:
-        logger.error(e)
-        return False
+        logger.error(f"Posts scraping failed for {company['name']}: {e}")
+    finally:
+        seconds = time.perf_counter() - started
+        step_timer.record("posts", seconds)
+        metrics.COMMAND_SECONDS.labels("CompanyPostsScraper").observe(seconds)
 
 
-async def navigate():
-    async with async_playwright() as p:
-        # browser configs
-        browser = await p.firefox.launch(headless=False)
+async def launch(p):
+    """
+    Launch Firefox; returns the browser, a factory for configured contexts
+    and the request blocker they share (None when blocking is off)
+    """
+    # browser configs
+    browser = await p.firefox.launch(headless=config.HEADLESS)
+    # skip images, fonts, media and tracking scripts the scraper never reads
+    blocker = None
+    if config.BLOCK_RESOURCES:
+        blocker = ResourceBlocker(block_types=config.BLOCKED_RESOURCE_TYPES, block_patterns=config.BLOCKED_URL_PATTERNS,
+                                  allow_patterns=config.ALLOWED_URL_PATTERNS, logger=logger)
+
+    async def open_context():
+        """A configured browser context; every account gets its own cookie jar"""
         context = await browser.new_context(
             # viewport={"width": 414, "height": 896},  # iPhone 11 viewport size
             # user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1"
@@ -63,51 +159,190 @@ async def navigate():
                 });
             """
             )
-        controller = linkednController()
-        # load cookies first else login if cookies doesn't exist
+        if blocker is not None:
+            await blocker.install(context)
+        return context
+
+    return browser, open_context, blocker
+
+
+async def open_sessions(open_context, workers=config.WORKERS):
+    """One context per account, signed in from its cookie jar (or with its credentials)"""
+    sessions = SessionPool(open_context, logger, max_pages=config.SESSION_MAX_PAGES or workers,
+                           bench_seconds=config.SESSION_BENCH_MINUTES * 60, login_url=config.BASE_URL)
+    return await sessions.open()
+
+
+def serve_metrics():
+    if config.METRICS_PORT:
+        metrics.serve(config.METRICS_PORT)
+        logger.info(f"Metrics served on http://127.0.0.1:{config.METRICS_PORT}/metrics")
+
+
+async def scrape_companies(sessions, companies, workers=config.WORKERS, resume=False, blocker=None, sink=None,
+                           posts=config.SCRAPE_POSTS, jobs=None, parse_pool=None):
+    """
+    Scrape `companies` (dicts with a "name" and optionally the company page
+    "url", any iterable, consumed lazily) with already signed-in sessions
+    and return the per-worker stats. Results go to `sink`, by default the
+    JSONL results file, and posts (when `posts` is set) to the posts file.
+    A caller running several batches (the daemon) passes its own `jobs`
+    store and `parse_pool`; they are left open for the next batch.
+    """
+    # per-company status survives crashes; a resumed run skips what is already done
+    own_jobs = jobs is None
+    if own_jobs:
+        jobs = JobStore()
+    if not resume:
+        jobs.reset()
+    companies = (company for company in companies if jobs.should_run(company["name"], resume))
+    logger.info(f"Job state at start {jobs.summary()}")
+
+    def finished(name, outcome=None):
+        jobs.finish(name, outcome)
+        metrics.COMPANIES.labels("done").inc()
+        if outcome:
+            metrics.ABOUT_PAGES.labels(outcome).inc()
+
+    def failed(name, error):
+        jobs.fail(name, error)
+        metrics.COMPANIES.labels("failed").inc()
+
+    # name -> company URL resolutions shared by every worker and kept across runs
+    cache = ResolutionCache(ttl=config.RESOLUTION_TTL_DAYS * 24 * 3600, logger=logger,
+                            save_interval=config.RESOLUTION_SAVE_INTERVAL)
+
+    # one long-lived writer for the whole run, flushed in batches off the event loop
+    if sink is None:
+        sink = JsonlResultWriter(batch_size=config.RESULTS_BATCH_SIZE, flush_interval=config.RESULTS_FLUSH_INTERVAL,
+                                 logger=logger)
+    await sink.start()
+
+    posts_sink, post_store = None, None
+    if posts:
+        posts_sink = JsonlResultWriter(path=posts_filepath, batch_size=config.RESULTS_BATCH_SIZE,
+                                       flush_interval=config.RESULTS_FLUSH_INTERVAL, logger=logger)
+        await posts_sink.start()
+        post_store = SeenPostStore()
+
+    own_parse_pool = parse_pool is None and config.PARSE_PROCESSES > 0
+    if own_parse_pool:
+        from scraper.parsing import ParsePool
+
+        # records come back to each company's job through the future ParseHandOff returns
+        parse_pool = ParsePool(None, logger, processes=config.PARSE_PROCESSES, max_pending=config.PARSE_QUEUE_SIZE)
+        await parse_pool.start()
+
+    async def job(worker_page, company, session):
+        # resolutions from earlier companies, saved from a thread every RESOLUTION_SAVE_INTERVAL
+        await cache.flush()
+        if jobs.status(company["name"]) in (FAILED, IN_PROGRESS):
+            metrics.RETRIES.labels("company").inc()
+        jobs.start(company["name"])
+        last_fingerprint = jobs.fingerprint(company["name"]) if config.CHANGE_DETECTION else None
         try:
-            load = await load_cookies(context, logger)
-            page = await context.new_page()
-            page.set_default_timeout(15000)
-            if load:
-                await page.goto('https://www.linkedin.com/feed')
-                return
-            else:
-                from scraper.actions.login import loginAcct
-                controller.add_command(loginAcct(page, context, "https://www.linkedin.com", logger=logger))
-                await controller.execute_commands()
-                controller.clear_commands()
-                logger.info("Auth complete")
+            outcome = await asyncio.wait_for(
+                scrape_company(worker_page, session.context, company, logger, cache=cache,
+                               parse_pool=parse_pool, sink=sink, pacer=session.pacer,
+                               last_fingerprint=last_fingerprint),
+                config.COMPANY_TIMEOUT or None
+            )
+        except asyncio.TimeoutError:
+            failed(company["name"], f"Gave up after {config.COMPANY_TIMEOUT:.0f}s")
+            raise
         except Exception as e:
-            logger.error(f'{e}')
+            failed(company["name"], e)
+            raise
+        if not outcome["ok"]:
+            failed(company["name"], "About page not scraped")
+        elif not outcome["changed"]:
+            jobs.mark_seen(company["name"])
+            finished(company["name"], UNCHANGED)
+        else:
+            if outcome["fingerprint"]:
+                jobs.remember_fingerprint(company["name"], outcome["fingerprint"])
+            finished(company["name"], CHANGED)
+        # outside the company deadline: a long feed never fails an About page already scraped
+        if outcome["ok"] and posts_sink is not None:
+            await scrape_posts(worker_page, company, logger, posts_sink, store=post_store, pacer=session.pacer)
+        return outcome["ok"]
 
-        from scraper.actions.search import search
-        # get and loop through company and country data
-        base_folder = Path(__name__).resolve().parent
-        results_dir = base_folder / "scraper" / "companies.json"
-        # Load the JSON file
-        with open(results_dir, "r", encoding="utf-8") as file:
-            companies = json.load(file)
+    # companies that failed (pool.failures) are tried again once everything else is done
+    pool = WorkerPool(sessions, job, concurrency=workers, logger=logger, start_url=f"{config.BASE_URL}/feed",
+                      page_timeout=config.PAGE_TIMEOUT, breaker_failures=config.BREAKER_FAILURES,
+                      breaker_pause=config.BREAKER_PAUSE_SECONDS)
+    try:
+        rounds = [await pool.run(companies)]
+        for round_number in range(1, config.DEFERRED_ROUNDS + 1):
+            if not pool.failures:
+                break
+            retry = pool.failures
+            logger.info(f"Retrying {len(retry)} failed companies (deferred round {round_number})")
+            rounds.append(await pool.run(retry))
+        for company in pool.failures:
+            logger.warning(f"Giving up on {company['name']} for this run")
+        stats = final_stats(rounds)
+        logger.info(f"Run stats {[worker.as_dict() for worker in stats]}")
+    finally:
+        if own_parse_pool:
+            await parse_pool.stop()
+        await cache.flush(force=True)
+        await sink.close()
+        if posts_sink is not None:
+            await posts_sink.close()
+            post_store.close()
+        logger.info(f"Job state at end {jobs.summary()}")
+        if own_jobs:
+            jobs.close()
+        if blocker is not None:
+            logger.info(f"Blocked requests (bytes saved are estimated per resource type) {blocker.stats()}")
+        await strategies.flush(force=True)
+        for group, candidate, streak in strategies.stale():
+            logger.warning(f"Selector strategy stopped working: {group} -> {candidate} ({streak} failures in a row)")
+        if config.METRICS_TEXTFILE:
+            metrics_file = Path(__name__).resolve().parent / config.METRICS_TEXTFILE
+            metrics_file.parent.mkdir(parents=True, exist_ok=True)
+            metrics.write_textfile(metrics_file)
+            logger.info(f"Metrics written to {metrics_file}")
+
+    return stats
 
-        # Loop through each company and call the function with the name
-        for company in companies:
 
-            controller.add_command(search(page, context, name=company["name"], logger=logger))
-            await controller.execute_commands()
+async def navigate(companies_file=None, workers=config.WORKERS, resume=False, posts=config.SCRAPE_POSTS):
+    setup_logger("linkedn", "INFO")
+    async with async_playwright() as p:
+        browser, open_context, blocker = await launch(p)
+        sessions = await open_sessions(open_context, workers)
+        serve_metrics()
+
+        # get and loop through company and country data
+        if companies_file is None:
+            base_folder = Path(__name__).resolve().parent
+            companies_file = base_folder / "scraper" / "companies.json"
+        # read lazily: the workers start on the first rows while the rest of the file is still unread
+        companies = CompanyReader(companies_file, logger=logger)
 
-            # scrape page
-            from scraper.actions.scrape import CompanyAboutScraper
-            page_content = await page.content()
-            source_url = page.url
-            controller.clear_commands()
-            controller.add_command(CompanyAboutScraper(page_content, source_url,  logger=logger))
-            await controller.execute_commands()
+        try:
+            return await scrape_companies(sessions, companies, workers=workers, resume=resume, blocker=blocker,
+                                          posts=posts)
+        finally:
+            await sessions.close()
+            await browser.close()
 
-            controller.clear_commands()
 
-        await page.close()
-        await context.close()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn company About pages")
+    parser.add_argument("--companies", default=None,
+                        help="companies to scrape: JSON array, JSON Lines or CSV with a name and optional url/slug")
+    parser.add_argument("--workers", type=int, default=config.WORKERS,
+                        help="number of pages scraping concurrently")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip companies finished by a previous run and retry the failed ones")
+    parser.add_argument("--posts", action="store_true", default=config.SCRAPE_POSTS,
+                        help="also scrape each company's Posts feed, down to the posts seen by earlier runs")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    asyncio.run(navigate())
+    args = parse_args()
+    asyncio.run(navigate(companies_file=args.companies, workers=args.workers, resume=args.resume, posts=args.posts))
@@ -0,0 +1,45 @@
+"""
+    Prometheus metrics for unattended runs: step timings and counters
+"""
+from prometheus_client import CollectorRegistry, Counter, Histogram, start_http_server, write_to_textfile
+
+registry = CollectorRegistry()
+
+# seconds, from quick DOM checks up to slow page loads
+STEP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60)
+
+COMMAND_SECONDS = Histogram(
+    "scraper_command_seconds", "Time spent in each command's execute()", ["command"],
+    buckets=STEP_BUCKETS, registry=registry
+)
+FALLBACK_SECONDS = Histogram(
+    "scraper_fallback_method_seconds", "Time spent per fallback method of the interaction helpers",
+    ["helper", "method", "outcome"], buckets=STEP_BUCKETS, registry=registry
+)
+PAGE_LOAD_SECONDS = Histogram(
+    "scraper_page_load_seconds", "Time from triggering a navigation to the load state", ["step"],
+    buckets=STEP_BUCKETS, registry=registry
+)
+PARSE_SECONDS = Histogram(
+    "scraper_parse_seconds", "Time to parse a captured About page", ["mode"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5), registry=registry
+)
+RETRIES = Counter("scraper_retries_total", "Retried steps and companies", ["step"], registry=registry)
+POPUPS_DISMISSED = Counter("scraper_popups_dismissed_total", "Dialogs, windows and alerts dismissed", ["kind"],
+                           registry=registry)
+SELECTOR_FALLBACKS = Counter("scraper_selector_fallbacks_total",
+                             "Selector candidates or methods that failed and fell through to the next one",
+                             ["group"], registry=registry)
+COMPANIES = Counter("scraper_companies_total", "Companies finished, by outcome", ["status"], registry=registry)
+ABOUT_PAGES = Counter("scraper_about_pages_total", "About pages changed or unchanged since the last run",
+                      ["outcome"], registry=registry)
+
+
+def serve(port: int, address: str = "127.0.0.1"):
+    """Expose the metrics on http://address:port/metrics for the duration of the run"""
+    start_http_server(port, addr=address, registry=registry)
+
+
+def write_textfile(path):
+    """Dump the metrics in the text exposition format (node_exporter textfile collector)"""
+    write_to_textfile(str(path), registry)
@@ -0,0 +1,99 @@
+"""
+    Request interception profile that keeps browser contexts from loading what the scraper never reads
+"""
+import re
+from collections import Counter
+
+# the About scraper only needs the document and the scripts that render it
+BLOCKED_TYPES = ("image", "media", "font")
+
+# analytics beacons, ad and tracking scripts
+BLOCKED_PATTERNS = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"demdex\.net",
+    r"omtrdc\.net",
+    r"adnxs\.com",
+    r"bat\.bing\.com",
+    r"connect\.facebook\.net",
+    r"px\.ads\.linkedin\.com",
+    r"snap\.licdn\.com/li\.lms-analytics",
+    r"linkedin\.com/li/track",
+    r"linkedin\.com/.*/(tracking|beacons?)\b",
+    r"platform\.linkedin\.com/litms",
+)
+
+# never block these: login / checkpoint pages (their captchas need images) and the search/About flow itself
+ALLOWED_PATTERNS = (
+    r"linkedin\.com/checkpoint/",
+    r"linkedin\.com/uas/",
+    r"linkedin\.com/login",
+    r"challenges?\.",
+    r"captcha",
+)
+
+# assumed transfer size of a blocked request per resource type: an aborted request never gets a
+# response, so the bytes it would have cost are only an estimate
+ESTIMATED_BYTES = {
+    "image": 30_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 60_000,
+    "stylesheet": 20_000,
+}
+DEFAULT_ESTIMATED_BYTES = 2_000
+
+
+class ResourceBlocker:
+    """
+        Routes every request of a BrowserContext and aborts the ones matching a
+        blocked resource type or URL pattern, unless the URL is allow-listed.
+        Keeps counters of blocked requests per resource type and an estimate of
+        the bytes that were not downloaded, from typical sizes per type (blocked
+        requests have no response to read a content-length from). URL patterns
+        left as None use the built-in lists.
+    """
+
+    def __init__(self, block_types=BLOCKED_TYPES, block_patterns=None, allow_patterns=None, logger=None):
+        block_patterns = BLOCKED_PATTERNS if block_patterns is None else block_patterns
+        allow_patterns = ALLOWED_PATTERNS if allow_patterns is None else allow_patterns
+        self.block_types = frozenset(block_types)
+        self.block_pattern = re.compile("|".join(block_patterns)) if block_patterns else None
+        self.allow_pattern = re.compile("|".join(allow_patterns)) if allow_patterns else None
+        self.logger = logger
+        self.blocked = Counter()
+        self.allowed = 0
+        self.estimated_bytes_saved = 0
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if self.allow_pattern and self.allow_pattern.search(url):
+            return False
+        if resource_type in self.block_types:
+            return True
+        return bool(self.block_pattern and self.block_pattern.search(url))
+
+    async def handle(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        if self.should_block(request.url, resource_type):
+            self.blocked[resource_type] += 1
+            self.estimated_bytes_saved += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+            await route.abort("blockedbyclient")
+        else:
+            self.allowed += 1
+            await route.continue_()
+
+    async def install(self, context):
+        """Start intercepting every request made by pages of the context"""
+        await context.route("**/*", self.handle)
+        if self.logger:
+            self.logger.info(f"Blocking resource types {sorted(self.block_types)} and tracking URLs")
+
+    def stats(self) -> dict:
+        return {
+            "blocked": sum(self.blocked.values()),
+            "blocked_by_type": dict(self.blocked),
+            "allowed": self.allowed,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+        }
@@ -0,0 +1,114 @@
+"""
+    Adaptive pacing: per-action waits with jitter, a shared rate limit and throttling back-off
+"""
+import asyncio
+import random
+import re
+import time
+
+import config
+
+# action -> (low, mode, high) seconds of a triangular distribution, and how many
+# rate-limit tokens the action costs (actions that make the site load something)
+ACTION_PROFILES = {
+    "keystroke": ((0.06, 0.09, 0.18), 0),
+    "think": ((1.0, 1.8, 4.0), 0),
+    "navigate": ((1.5, 2.5, 7.0), 1),
+    "click": ((0.4, 0.8, 2.0), 0),
+    "scroll": ((0.8, 1.5, 3.5), 0),
+}
+
+# URLs LinkedIn sends a session to when it thinks it is going too fast
+THROTTLE_URL = re.compile(r"/checkpoint/|/authwall|/uas/login|too-many-requests", re.IGNORECASE)
+
+
+class CheckpointError(RuntimeError):
+    """The session was sent to a checkpoint: the company fails now, retrying on this session cannot help"""
+    retryable = False
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` actions on average with bursts up to `burst`"""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, cost: float = 1):
+        if cost <= 0 or self.rate <= 0:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                await asyncio.sleep((cost - self.tokens) / self.rate)
+
+
+class Pacer:
+    """
+        Plans the wait before each action from its profile, scaled by a speed
+        factor that drifts down while pages load fast and jumps up on throttling
+        signals (checkpoint URLs, failed loads). Actions that load pages also
+        draw from a token bucket shared by every worker using the same account.
+    """
+
+    def __init__(self, profiles=None, rate_per_minute: float = 20, burst: int = 4, fast_load: float = 2.0,
+                 min_factor: float = 0.5, max_factor: float = 6.0, logger=None):
+        self.profiles = profiles or ACTION_PROFILES
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.fast_load = fast_load
+        self.min_factor = min_factor
+        self.max_factor = max_factor
+        self.factor = 1.0
+        self.load_seconds = None
+        self.throttle_events = 0
+        self.checkpoints = 0
+        self.logger = logger
+        self.rng = random.Random()
+
+    def plan(self, action: str) -> float:
+        """Seconds to wait before `action`, jittered and scaled by the current factor"""
+        (low, mode, high), _ = self.profiles.get(action, self.profiles["think"])
+        return self.rng.triangular(low, high, mode) * self.factor
+
+    async def wait(self, action: str):
+        _, cost = self.profiles.get(action, self.profiles["think"])
+        await self.bucket.acquire(cost)
+        await asyncio.sleep(self.plan(action))
+
+    def keystroke_delay(self) -> float:
+        """Per-key typing delay in milliseconds, for keyboard.type(delay=...)"""
+        return self.plan("keystroke") * 1000
+
+    def observe_load(self, seconds: float):
+        """Feed a page load time; fast responses shorten the waits, slow ones lengthen them"""
+        self.load_seconds = seconds if self.load_seconds is None else 0.8 * self.load_seconds + 0.2 * seconds
+        if self.load_seconds < self.fast_load:
+            self.factor = max(self.min_factor, self.factor * 0.95)
+        elif self.load_seconds > 3 * self.fast_load:
+            self.factor = min(self.max_factor, self.factor * 1.1)
+
+    def throttled(self, reason: str):
+        """Back off sharply after a throttling signal"""
+        self.throttle_events += 1
+        self.factor = min(self.max_factor, self.factor * 2)
+        if self.logger:
+            self.logger.warning(f"Throttling signal ({reason}), pacing factor now {self.factor:.2f}")
+
+    def check_url(self, url: str) -> bool:
+        """Report a throttling signal if the page was redirected to a checkpoint; True when throttled"""
+        if url and THROTTLE_URL.search(url):
+            self.checkpoints += 1
+            self.throttled(f"redirected to {url}")
+            return True
+        return False
+
+
+pacer = Pacer(rate_per_minute=config.PACE_RATE_PER_MINUTE, burst=config.PACE_BURST)
@@ -0,0 +1,124 @@
+"""
+    Process pool stage that parses captured About pages off the event loop
+"""
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from scraper.actions.base import Base
+from scraper.actions.scrape import parse_company_about
+from scraper.logger import init_child_logging, start_child_listener
+from scraper.metrics import PARSE_SECONDS
+
+
+class ParsePool:
+    """
+        Parses captured pages on other cores while the browser keeps navigating.
+
+        Pages are handed over through a bounded queue: `submit()` waits once
+        `max_pending` pages are queued, so the browser side slows down instead
+        of piling up HTML in memory when the parsers fall behind. `submit()`
+        returns a future of the parsed record (or of the parse error); every
+        parsed page is also passed to `on_result(key, data)` (sync or async),
+        failures to `on_error(key, exc)`, when given.
+
+        The parse processes log through a queue to this process, which writes
+        their records to the same log file.
+    """
+
+    def __init__(self, on_result, logger, processes: int = 2, max_pending: int = 8, on_error=None):
+        self.on_result = on_result
+        self.on_error = on_error
+        self.logger = logger
+        self.processes = max(1, int(processes))
+        self.max_pending = max(1, int(max_pending))
+        self.executor = None
+        self.queue = None
+        self.consumers = []
+        self.log_listener = None
+
+    async def start(self):
+        # spawn rather than fork: the parent holds the Playwright driver pipes and a running loop
+        mp_context = multiprocessing.get_context("spawn")
+        log_queue, self.log_listener = start_child_listener(mp_context)
+        level = logging.getLogger("linkedn.parser").getEffectiveLevel()
+        self.executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=mp_context,
+                                            initializer=init_child_logging, initargs=(log_queue, level))
+        self.queue = asyncio.Queue(maxsize=self.max_pending)
+        self.consumers = [asyncio.create_task(self.consume()) for _ in range(self.processes)]
+        self.logger.info(f"Parse pool started with {self.processes} processes, {self.max_pending} pending pages max")
+
+    async def submit(self, page_content: str, source_url: str, key=None) -> asyncio.Future:
+        """Queue a page for parsing; blocks while the queue is full. Returns the future of its record"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((page_content, source_url, key, future))
+        return future
+
+    async def consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.queue.get()
+            try:
+                if item is None:
+                    return
+                page_content, source_url, key, future = item
+                try:
+                    started = time.perf_counter()
+                    data = await loop.run_in_executor(self.executor, parse_company_about, page_content, source_url)
+                    PARSE_SECONDS.labels("process").observe(time.perf_counter() - started)
+                    # the submitter may have given up waiting (company deadline)
+                    if not future.done():
+                        future.set_result(data)
+                    if self.on_result:
+                        result = self.on_result(key, data)
+                        if inspect.isawaitable(result):
+                            await result
+                except Exception as e:
+                    self.logger.error(f"Parsing failed for {key or source_url}: {e}")
+                    if not future.done():
+                        future.set_exception(e)
+                    if self.on_error:
+                        result = self.on_error(key, e)
+                        if inspect.isawaitable(result):
+                            await result
+            finally:
+                self.queue.task_done()
+
+    async def stop(self):
+        """Drain queued pages, then shut the consumers and processes down"""
+        if self.queue is None:
+            return
+        for _ in self.consumers:
+            await self.queue.put(None)
+        await asyncio.gather(*self.consumers)
+        self.consumers = []
+        self.executor.shutdown(wait=True)
+        self.log_listener.stop()
+        self.logger.info("Parse pool stopped")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+
+class ParseHandOff(Base):
+    """
+        Hand a captured page to the parse pool instead of parsing it on the
+        event loop; the result is the future of the parsed record
+    """
+
+    def __init__(self, parse_pool: ParsePool, page_content: str, source_url: str, key=None):
+        super().__init__()
+        self.parse_pool = parse_pool
+        self.page_content = page_content
+        self.source_url = source_url
+        self.key = key
+
+    async def execute(self):
+        return await self.parse_pool.submit(self.page_content, self.source_url, key=self.key)
@@ -0,0 +1,51 @@
+"""
+    Activity URNs of company posts already scraped, so later runs stop where the last one began
+"""
+import sqlite3
+import time
+from pathlib import Path
+
+from .cache import normalize_name
+
+parent_dir = Path(__name__).resolve().parent  # Get the parent directory of the current directory
+posts_filepath = parent_dir / 'scraper' / 'posts.sqlite3'
+
+
+class SeenPostStore:
+    """
+        SQLite set of (company, activity URN) pairs with the time each post was
+        first scraped. Like the job state, every update is committed at once.
+    """
+
+    def __init__(self, path=posts_filepath):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS posts (
+                company TEXT NOT NULL,
+                urn TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                PRIMARY KEY (company, urn)
+            )"""
+        )
+        self.db.commit()
+
+    def seen(self, company: str, urn: str) -> bool:
+        row = self.db.execute("SELECT 1 FROM posts WHERE company = ? AND urn = ?",
+                              (normalize_name(company), urn)).fetchone()
+        return row is not None
+
+    def add(self, company: str, urns):
+        now = time.time()
+        self.db.executemany("INSERT OR IGNORE INTO posts (company, urn, first_seen) VALUES (?, ?, ?)",
+                            [(normalize_name(company), urn, now) for urn in urns])
+        self.db.commit()
+
+    def count(self, company: str) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM posts WHERE company = ?",
+                               (normalize_name(company),)).fetchone()[0]
+
+    def close(self):
+        self.db.close()
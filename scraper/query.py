@@ -0,0 +1,207 @@
+"""
+    In-memory indexes over the scraped companies, persisted next to the results
+"""
+import bisect
+import os
+import pickle
+import re
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from models import CompanyRecord
+from schema import parse_company_size
+from .cache import company_root, normalize_name
+from .sinks import legacy_results_filepath, read_records, results_filepath
+
+INDEX_VERSION = 1
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or our the to we with".split()
+)
+
+
+def tokenize(text: str):
+    """Searchable words of a text: normalized like company names, stop words and 1-letter words left out"""
+    return [word for word in normalize_name(text).split() if len(word) > 1 and word not in STOPWORDS]
+
+
+def size_bucket(size_min, size_max):
+    """Key of a company size range: "11-50", "10001+", "" when unknown"""
+    if size_min is None:
+        return ""
+    return f"{size_min}+" if size_max is None else f"{size_min}-{size_max}"
+
+
+def source_signature(inputs) -> dict:
+    """Size and mtime of every results file, to tell whether a saved index is still current"""
+    signature = {}
+    for path in inputs:
+        stat = os.stat(path)
+        signature[str(path)] = (stat.st_size, stat.st_mtime_ns)
+    return signature
+
+
+class CompanyIndex:
+    """
+        Latest record per company with hash indexes on industry, country and
+        size bucket, the founding years sorted for range queries and an
+        inverted index over the description and specialties.
+
+        Index values are record positions; a query intersects the smallest
+        candidate sets first, so it never scans all the records.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.industry = defaultdict(list)
+        self.country = defaultdict(list)
+        self.size = defaultdict(list)
+        self.years = []      # founding years, sorted
+        self.year_ids = []   # record position of each entry in `years`
+        self.terms = defaultdict(dict)  # word -> {record position: occurrences}
+        self.sources = {}
+        self.built = 0.0
+
+    @classmethod
+    def build(cls, inputs, logger=None):
+        """Index every record of the results files, the last one read winning for each company"""
+        latest = {}
+        for path in inputs:
+            for data in read_records(path):
+                record = CompanyRecord.from_dict(data)
+                url = record.source_company_url or ""
+                key = company_root(url) or url or normalize_name(record.source_company_name)
+                if key:
+                    latest.pop(key, None)  # keep the order of the latest scrape
+                    latest[key] = record
+            if logger:
+                logger.info(f"Read {path}")
+
+        index = cls()
+        for record in latest.values():
+            index.add(record)
+        index.finish(inputs)
+        return index
+
+    def add(self, record: CompanyRecord):
+        position = len(self.records)
+        self.records.append(record)
+        for table, value in ((self.industry, record.source_company_sector_or_activity),
+                             (self.country, record.source_company_countries)):
+            key = normalize_name(value)
+            if key:
+                table[key].append(position)
+        bucket = size_bucket(record.source_company_size_min, record.source_company_size_max)
+        if bucket:
+            self.size[bucket].append(position)
+        if record.source_founding_year is not None:
+            self.years.append((record.source_founding_year, position))
+        words = tokenize(record.source_company_business_description) + tokenize(record.source_company_specialties)
+        for word, count in Counter(words).items():
+            self.terms[word][position] = count
+
+    def finish(self, inputs):
+        self.years.sort()
+        self.year_ids = [position for _, position in self.years]
+        self.years = [year for year, _ in self.years]
+        # plain dicts pickle without the default factories
+        self.industry, self.country, self.size, self.terms = (
+            dict(self.industry), dict(self.country), dict(self.size), dict(self.terms)
+        )
+        self.sources = source_signature(inputs)
+        self.built = time.time()
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((INDEX_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path):
+        """The index saved at `path`, or None when there is none or it was written by another version"""
+        try:
+            with open(path, "rb") as f:
+                version, index = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+            return None
+        return index if version == INDEX_VERSION else None
+
+    def years_between(self, founded_from=None, founded_to=None):
+        low = 0 if founded_from is None else bisect.bisect_left(self.years, founded_from)
+        high = len(self.years) if founded_to is None else bisect.bisect_right(self.years, founded_to)
+        return self.year_ids[low:high]
+
+    def search(self, industry: str = None, country: str = None, size: str = None,
+               founded_from: int = None, founded_to: int = None, text: str = None, limit: int = 50) -> dict:
+        """
+        Companies matching every given filter. `size` is a size text ("11-50",
+        "51-200 employees", "10,001+"), `text` keywords that must all appear in
+        the description or specialties; keyword matches come best first.
+        """
+        started = time.perf_counter()
+        candidates = []
+        if industry:
+            candidates.append(self.industry.get(normalize_name(industry), ()))
+        if country:
+            candidates.append(self.country.get(normalize_name(country), ()))
+        if size:
+            candidates.append(self.size.get(size_bucket(*parse_company_size(size)), ()))
+        if founded_from is not None or founded_to is not None:
+            candidates.append(self.years_between(founded_from, founded_to))
+        postings = [self.terms.get(word, {}) for word in tokenize(text or "")]
+        if text and not postings:
+            postings = [{}]  # only stop words: nothing to match on
+        candidates.extend(postings)
+
+        if candidates:
+            candidates.sort(key=len)
+            matches = set(candidates[0])
+            for positions in candidates[1:]:
+                if not matches:
+                    break
+                matches.intersection_update(positions)
+        else:
+            matches = range(len(self.records))
+
+        if postings:
+            ranked = sorted(matches, key=lambda position: (-sum(p[position] for p in postings), position))
+        else:
+            ranked = sorted(matches)
+        return {
+            "total": len(ranked),
+            "results": [self.records[position].to_dict() for position in ranked[:limit]],
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "companies": len(self.records),
+            "industries": len(self.industry),
+            "countries": len(self.country),
+            "size_buckets": sorted(self.size, key=lambda bucket: int(re.match(r"\d+", bucket).group())),
+            "terms": len(self.terms),
+            "built": self.built,
+        }
+
+
+def default_inputs():
+    return [path for path in (legacy_results_filepath, results_filepath) if path.exists()]
+
+
+def load_index(path, inputs=None, rebuild: bool = False, logger=None) -> CompanyIndex:
+    """The saved index when its results files did not change since it was built, else a fresh one (saved)"""
+    inputs = default_inputs() if inputs is None else inputs
+    if not rebuild:
+        index = CompanyIndex.load(path)
+        if index is not None and index.sources == source_signature(inputs):
+            return index
+    started = time.perf_counter()
+    index = CompanyIndex.build(inputs, logger)
+    index.save(path)
+    if logger:
+        logger.info(f"Indexed {len(index.records)} companies in {time.perf_counter() - started:.2f}s -> {path}")
+    return index
@@ -0,0 +1,54 @@
+"""
+    Backoff between retries and a circuit breaker for failing workers
+"""
+import asyncio
+import random
+import time
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 30.0) -> float:
+    """Seconds to wait before retry number `attempt` (1, 2, ...): exponential, capped, with full jitter"""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+        Opens after `threshold` failures in a row. While it is open `wait()`
+        sleeps out the rest of the `pause`, then lets one attempt through:
+        a success closes the breaker, another failure opens it again.
+    """
+
+    def __init__(self, threshold: int, pause: float, logger=None, name: str = "worker"):
+        self.threshold = threshold
+        self.pause = pause
+        self.logger = logger
+        self.name = name
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+
+    @property
+    def open(self) -> bool:
+        return self.opened_at is not None
+
+    def record(self, ok: bool):
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.threshold and self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self.trips += 1
+            if self.logger:
+                self.logger.warning(f"{self.name} paused for {self.pause:.0f}s after {self.failures} failures in a row")
+
+    async def wait(self):
+        if self.opened_at is None:
+            return
+        remaining = self.pause - (time.monotonic() - self.opened_at)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        # half open: the next failure trips it again straight away
+        self.opened_at = None
+        self.failures = max(0, self.threshold - 1)
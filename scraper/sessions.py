@@ -0,0 +1,231 @@
+"""
+    Pool of logged-in accounts, each with its own browser context, cookie jar, pacer and health state
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+import config
+from .pacing import THROTTLE_URL, Pacer
+
+
+def load_accounts(path=None) -> list:
+    """
+    Accounts from the accounts file (a JSON list of {"name", "username",
+    "password", "cookies"}), else the single USERNAME/PASSWORD account
+    with scraper/cookies.json as before.
+    """
+    base_folder = Path(__name__).resolve().parent
+    path = Path(path) if path else base_folder / config.ACCOUNTS_FILE
+    if not path.exists():
+        return [{
+            "name": "default",
+            "username": os.getenv("USERNAME"),
+            "password": os.getenv("PASSWORD"),
+            "cookies": str(base_folder / "scraper" / "cookies.json"),
+        }]
+
+    with open(path, "r", encoding="utf-8") as f:
+        accounts = json.load(f)
+    for index, account in enumerate(accounts):
+        account.setdefault("name", account.get("username") or f"account-{index}")
+        slug = re.sub(r"[^a-z0-9]+", "-", account["name"].lower()).strip("-")
+        cookies = Path(account.get("cookies") or Path("scraper") / "cookies" / f"{slug}.json")
+        account["cookies"] = str(cookies if cookies.is_absolute() else base_folder / cookies)
+    return accounts
+
+
+# load cookies if it exists
+async def load_cookies(context, logger, path=None):
+    try:
+        if path is None:
+            base_folder = Path(__name__).resolve().parent
+            path = base_folder / 'scraper' / 'cookies.json'
+        # load cookies of the user from the file
+        with open(path, "r") as f:
+            cookies = json.load(f)
+            await context.add_cookies(cookies)
+            logger.info(f"Cookies loaded for successfully from {path}")
+        return True
+    except Exception as e:
+        logger.error(e)
+        return False
+
+
+class Session:
+    """One account: its browser context, idle pages, pacer and health"""
+
+    def __init__(self, account: dict, context, logger, max_pages: int):
+        self.account = account
+        self.name = account["name"]
+        self.context = context
+        self.logger = logger
+        self.max_pages = max(1, int(max_pages))
+        # every account is rate limited on its own
+        self.pacer = Pacer(rate_per_minute=config.PACE_RATE_PER_MINUTE, burst=config.PACE_BURST, logger=logger)
+        self.idle_pages = []
+        self.active = 0
+        self.done = 0
+        self.failed = 0
+        self.benched_until = 0.0
+        self.bench_reason = None
+        self.checkpoints_seen = 0
+        self.dead = False
+
+    @property
+    def healthy(self) -> bool:
+        return not self.dead and time.monotonic() >= self.benched_until
+
+    def retire(self, reason: str):
+        """Take the session out for the rest of the run (it could not sign in)"""
+        self.dead = True
+        self.bench_reason = reason
+        self.logger.error(f"Session {self.name} out of the pool: {reason}")
+
+    def bench(self, seconds: float, reason: str):
+        self.benched_until = time.monotonic() + seconds
+        self.bench_reason = reason
+        self.logger.warning(f"Session {self.name} benched for {seconds:.0f}s: {reason}")
+
+    async def checkout_page(self, start_url: str, page_timeout: int):
+        """An idle page of this account, or a new one opened on `start_url`"""
+        if self.idle_pages:
+            return self.idle_pages.pop()
+        page = await self.context.new_page()
+        page.set_default_timeout(page_timeout)
+        try:
+            await page.goto(start_url)
+        except Exception as e:
+            self.logger.error(f"Session {self.name} could not open {start_url}: {e}")
+        return page
+
+    def checkin_page(self, page):
+        if not page.is_closed():
+            self.idle_pages.append(page)
+
+    def as_dict(self):
+        return {
+            "session": self.name,
+            "done": self.done,
+            "failed": self.failed,
+            "checkpoints": self.pacer.checkpoints,
+            "pacing_factor": round(self.pacer.factor, 2),
+            "benched": not self.healthy,
+            "dead": self.dead,
+            "bench_reason": self.bench_reason,
+        }
+
+
+class SessionPool:
+    """
+        Spreads the work over several accounts.
+
+        `open_context()` is an async callable returning a fresh, configured
+        browser context; every account gets its own and is signed in from its
+        cookie jar (or with its credentials). `acquire()` hands out the healthy
+        session with the fewest pages in use, waiting when all are busy or
+        benched, and a session redirected to a checkpoint is benched for
+        `bench_seconds` so the others carry on without it. A session that
+        cannot sign in is retired; `acquire()` raises once none is left.
+    """
+
+    def __init__(self, open_context, logger, accounts=None, max_pages: int = 3, bench_seconds: float = 1800,
+                 login_url: str = "https://www.linkedin.com"):
+        self.open_context = open_context
+        self.logger = logger
+        self.accounts = accounts if accounts is not None else load_accounts()
+        self.max_pages = max_pages
+        self.bench_seconds = bench_seconds
+        self.login_url = login_url
+        self.sessions = []
+        self.changed = None
+
+    async def open(self):
+        self.changed = asyncio.Condition()
+        for account in self.accounts:
+            context = await self.open_context()
+            session = Session(account, context, self.logger, self.max_pages)
+            if not await self.authenticate(session):
+                session.retire("sign in failed")
+            self.sessions.append(session)
+        self.logger.info(f"Session pool opened with {len(self.sessions)} accounts: "
+                         f"{[session.name for session in self.sessions]}")
+        return self
+
+    async def authenticate(self, session: Session) -> bool:
+        """Load the account's cookie jar, else sign in and save a new one; False when signing in failed"""
+        from scraper.actions.base import linkednController
+        from scraper.actions.login import loginAcct
+
+        try:
+            loaded = await load_cookies(session.context, self.logger, session.account["cookies"])
+            if not loaded:
+                page = await session.context.new_page()
+                controller = linkednController()
+                controller.add_command(loginAcct(page, session.context, self.login_url, logger=self.logger,
+                                                 account=session.account, pacer=session.pacer))
+                await controller.execute_commands()
+                # still on the login form or sent to a checkpoint: the context is not signed in
+                landed_on = page.url
+                await page.close()
+                if THROTTLE_URL.search(landed_on):
+                    self.logger.error(f"Sign in failed for {session.name}: ended on {landed_on}")
+                    return False
+                self.logger.info(f"Auth complete for {session.name}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Sign in failed for {session.name}: {e}")
+            return False
+
+    async def acquire(self) -> Session:
+        """Wait for and reserve a page slot on the least-loaded healthy session"""
+        async with self.changed:
+            while True:
+                if all(session.dead for session in self.sessions):
+                    raise RuntimeError("No signed-in session left to scrape with")
+                available = [session for session in self.sessions
+                             if session.healthy and session.active < session.max_pages]
+                if available:
+                    session = min(available, key=lambda s: (s.active / s.max_pages, s.done + s.failed))
+                    session.active += 1
+                    return session
+                # wake up on a release, or when the first benched session is back
+                benched = [session.benched_until for session in self.sessions if not session.healthy]
+                timeout = max(0.0, min(benched) - time.monotonic()) if benched else None
+                try:
+                    await asyncio.wait_for(self.changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, session: Session, ok: bool):
+        """Give the slot back and bench the session if it was sent to a checkpoint meanwhile"""
+        async with self.changed:
+            session.active -= 1
+            if ok:
+                session.done += 1
+            else:
+                session.failed += 1
+            if session.pacer.checkpoints > session.checkpoints_seen:
+                session.checkpoints_seen = session.pacer.checkpoints
+                session.bench(self.bench_seconds, "redirected to a checkpoint")
+            self.changed.notify_all()
+
+    def stats(self):
+        return [session.as_dict() for session in self.sessions]
+
+    async def close(self):
+        for session in self.sessions:
+            self.logger.info(f"Session stats {session.as_dict()}")
+            try:
+                await session.context.close()
+            except Exception as e:
+                self.logger.error(f"Closing session {session.name} failed: {e}")
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
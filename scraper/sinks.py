@@ -0,0 +1,159 @@
+"""
+    Result sinks: where scraped records end up
+"""
+import asyncio
+import json
+import os
+from pathlib import Path
+
+parent_dir = Path(__name__).resolve().parent  # Get the parent directory of the current directory
+results_filepath = parent_dir / 'scraper' / 'results' / 'companies_about.jsonl'
+# written by older versions: pretty-printed JSON objects appended back to back
+legacy_results_filepath = parent_dir / 'scraper' / 'results' / 'companies_about.json'
+posts_filepath = parent_dir / 'scraper' / 'results' / 'company_posts.jsonl'
+
+
+def serialize(record) -> str:
+    """One JSON line for a record; CompanyRecords use their own faster encoder"""
+    to_json = getattr(record, "to_json", None)
+    if to_json is not None:
+        return to_json()
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def iter_concatenated(path, chunksize: int):
+    """Lists of records from a file of back to back JSON objects (the old json.dump appends)"""
+    decoder = json.JSONDecoder()
+    buffer, records = "", []
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            block = f.read(1 << 20)
+            buffer += block
+            while True:
+                buffer = buffer.lstrip()
+                if not buffer:
+                    break
+                try:
+                    record, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    break  # object continues in the next block
+                records.append(record)
+                buffer = buffer[end:]
+                if len(records) >= chunksize:
+                    yield records
+                    records = []
+            if not block:
+                break
+    if records:
+        yield records
+
+
+def read_records(path, chunksize: int = 1000):
+    """Every record of a results file, JSON Lines or the legacy concatenated JSON, as dicts"""
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        for records in iter_concatenated(path, chunksize):
+            yield from records
+
+
+class JsonlResultWriter:
+    """
+        Long-lived append-only JSON Lines writer.
+
+        `write()` only buffers the record; the buffer is written by a worker
+        thread once `batch_size` records are waiting or every `flush_interval`
+        seconds, so disk I/O never runs on the event loop. `close()` writes
+        what is left and fsyncs the file.
+    """
+
+    def __init__(self, path=results_filepath, batch_size: int = 50, flush_interval: float = 5.0, logger=None):
+        self.path = Path(path)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.logger = logger
+        self.buffer = []
+        self.written = 0
+        self.file = None
+        self.lock = None
+        self.flush_task = None
+        self.stopping = None
+        self.pending = set()
+
+    async def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = await asyncio.to_thread(open, self.path, "a", encoding="utf-8")
+        self.lock = asyncio.Lock()
+        self.stopping = asyncio.Event()
+        if self.flush_interval:
+            self.flush_task = asyncio.create_task(self.flush_periodically())
+        return self
+
+    def write(self, record):
+        """Buffer a record; schedules a background flush when the batch is full"""
+        self.buffer.append(serialize(record))
+        if len(self.buffer) >= self.batch_size:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+
+    async def flush(self, durable: bool = False):
+        async with self.lock:
+            lines, self.buffer = self.buffer, []
+            if lines or durable:
+                try:
+                    await asyncio.to_thread(self.write_lines, lines, durable)
+                except Exception:
+                    # keep the batch for the next flush; the exporter drops a partly written duplicate
+                    self.buffer[:0] = lines
+                    raise
+                self.written += len(lines)
+
+    def write_lines(self, lines, durable=False):
+        self.file.write("".join(lines))
+        self.file.flush()
+        if durable:
+            os.fsync(self.file.fileno())
+
+    async def flush_periodically(self):
+        """Flush every `flush_interval` seconds until `close()` sets `stopping`"""
+        while not self.stopping.is_set():
+            try:
+                await asyncio.wait_for(self.stopping.wait(), self.flush_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Flushing results to {self.path} failed: {e}")
+
+    async def close(self):
+        """Flush everything still buffered to disk and close the file"""
+        if self.file is None:
+            return
+        # never cancel a flush mid-write: let the periodic task see the stop signal and return
+        self.stopping.set()
+        if self.flush_task:
+            await self.flush_task
+            self.flush_task = None
+        if self.pending:
+            for result in await asyncio.gather(*self.pending, return_exceptions=True):
+                if isinstance(result, Exception) and self.logger:
+                    self.logger.error(f"Flushing results to {self.path} failed: {result}")
+        await self.flush(durable=True)
+        await asyncio.to_thread(self.file.close)
+        self.file = None
+        if self.logger:
+            self.logger.info(f"{self.written} records written to {self.path}")
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
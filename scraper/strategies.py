@@ -0,0 +1,125 @@
+"""
+    Persisted success table that reorders selector candidates and fallback methods
+"""
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+parent_dir = Path(__name__).resolve().parent  # Get the parent directory of the current directory
+strategies_filepath = parent_dir / 'scraper' / 'strategies.json'
+
+
+class StrategyCache:
+    """
+        Tracks, per group (e.g. "company_filter" or "click:<selector>"), how
+        each candidate selector or fallback method has been doing lately and
+        orders the candidates so the recent winner is tried first.
+
+        Counts decay on every attempt so old results fade; the score is the
+        smoothed recent success rate, ties broken by average latency.
+        Candidates never tried keep their original priority.
+
+        Every `save_every` records the table is written from a thread when an
+        event loop is running; `flush(force=True)` writes what is left.
+    """
+
+    def __init__(self, path=strategies_filepath, decay: float = 0.9, save_every: int = 20):
+        self.path = Path(path)
+        self.decay = decay
+        self.save_every = save_every
+        self.unsaved = 0
+        self.groups = {}
+        self.lock = None
+        self.pending = set()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.groups = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.groups = {}
+
+    def save(self, groups=None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.groups if groups is None else groups, f, indent=2)
+        os.replace(tmp_path, self.path)
+        if groups is None:
+            self.unsaved = 0
+
+    async def flush(self, force: bool = False):
+        """Write the table off the event loop once `save_every` records are unsaved (any, when forced)"""
+        if not self.unsaved or (not force and self.unsaved < self.save_every):
+            return
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            if not self.unsaved:
+                return
+            # entries are updated in place, so the snapshot copies them
+            groups = {group: {candidate: dict(entry) for candidate, entry in candidates.items()}
+                      for group, candidates in self.groups.items()}
+            unsaved, self.unsaved = self.unsaved, 0
+            try:
+                await asyncio.to_thread(self.save, groups)
+            except Exception:
+                # left for the next flush
+                self.unsaved += unsaved
+                raise
+
+    def score(self, entry) -> float:
+        return (entry["successes"] + 1) / (entry["successes"] + entry["failures"] + 2)
+
+    def order(self, group: str, candidates, key=None):
+        """Candidates sorted by recent success rate, then latency; `key` maps a candidate to its stored name"""
+        stats = self.groups.get(group, {})
+        key = key or (lambda candidate: candidate)
+        prior = {"successes": 0, "failures": 0, "seconds": 0.0}
+
+        def rank(item):
+            position, candidate = item
+            entry = stats.get(key(candidate), prior)
+            return -self.score(entry), entry["seconds"], position
+
+        return [candidate for _, candidate in sorted(enumerate(candidates), key=rank)]
+
+    def record(self, group: str, candidate: str, ok: bool, seconds: float):
+        entry = self.groups.setdefault(group, {}).setdefault(candidate, {
+            "successes": 0, "failures": 0, "seconds": 0.0, "streak": 0, "last_success": None, "last_failure": None,
+        })
+        entry["successes"] = entry["successes"] * self.decay + (1 if ok else 0)
+        entry["failures"] = entry["failures"] * self.decay + (0 if ok else 1)
+        entry["seconds"] = seconds if not entry["seconds"] else 0.7 * entry["seconds"] + 0.3 * seconds
+        if ok:
+            entry["streak"] = 0
+            entry["last_success"] = time.time()
+        else:
+            entry["streak"] += 1
+            entry["last_failure"] = time.time()
+
+        self.unsaved += 1
+        if self.unsaved >= self.save_every:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.save()
+                return
+            task = loop.create_task(self.flush())
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+
+    def stale(self, min_streak: int = 5):
+        """(group, candidate, failures in a row) for candidates that keep failing since their last success"""
+        return [
+            (group, candidate, entry["streak"])
+            for group, candidates in self.groups.items()
+            for candidate, entry in candidates.items()
+            if entry["streak"] >= min_streak
+        ]
+
+
+strategies = StrategyCache()
@@ -0,0 +1,42 @@
+"""
+    In-process record of how long each scraping step takes
+"""
+import math
+from collections import defaultdict
+
+
+def percentile(samples, fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class StepTimer:
+    """Collects per-step durations (seconds) for the run summary and the benchmarks"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def record(self, step: str, seconds: float):
+        self.samples[step].append(seconds)
+
+    def reset(self):
+        self.samples.clear()
+
+    def summary(self) -> dict:
+        return {
+            step: {
+                "count": len(samples),
+                "p50": percentile(samples, 0.50),
+                "p95": percentile(samples, 0.95),
+                "p99": percentile(samples, 0.99),
+                "total": sum(samples),
+            }
+            for step, samples in sorted(self.samples.items())
+        }
+
+
+step_timer = StepTimer()
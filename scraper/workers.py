@@ -0,0 +1,137 @@
+"""
+    Bounded pool of pages that scrape companies concurrently
+"""
+import asyncio
+import time
+
+from .retry import CircuitBreaker
+
+
+class WorkerStats:
+    """Counters for a single worker page"""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.done = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.last_company = None
+        self.pauses = 0
+
+    def as_dict(self):
+        processed = self.done + self.failed
+        return {
+            "worker": self.worker_id,
+            "done": self.done,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "avg_seconds": round(self.busy_seconds / processed, 2) if processed else 0.0,
+            "last_company": self.last_company,
+            "pauses": self.pauses,
+        }
+
+
+def final_stats(rounds):
+    """
+    Per-worker totals of a run and its deferred rounds. Every failed company is
+    tried again in the next round, so only the last round's failures are final;
+    companies done, busy time and pauses add up over all rounds.
+    """
+    totals = [WorkerStats(stats.worker_id) for stats in rounds[0]]
+    for stats_round in rounds:
+        for total, stats in zip(totals, stats_round):
+            total.done += stats.done
+            total.failed = stats.failed
+            total.busy_seconds += stats.busy_seconds
+            total.pauses += stats.pauses
+            total.last_company = stats.last_company or total.last_company
+    return totals
+
+
+class WorkerPool:
+    """
+        Runs up to `concurrency` pages side by side across the accounts of a
+        SessionPool.
+
+        Every worker keeps pulling the next company off a shared queue, takes a
+        page of the least-loaded healthy session and hands both to `job`, an
+        async callable `job(page, company, session) -> bool`.
+
+        A worker whose last `breaker_failures` companies all failed stops
+        taking work for `breaker_pause` seconds, then tries one more.
+
+        Each `run()` starts with fresh stats and lists the companies it failed
+        in `failures`, so the same pool can run the deferred retries.
+    """
+
+    def __init__(self, sessions, job, concurrency: int, logger, start_url: str = "https://www.linkedin.com/feed",
+                 page_timeout: int = 15000, breaker_failures: int = 0, breaker_pause: float = 0.0):
+        self.sessions = sessions
+        self.job = job
+        self.concurrency = max(1, int(concurrency))
+        self.logger = logger
+        self.start_url = start_url
+        self.page_timeout = page_timeout
+        self.stats = []
+        self.failures = []
+        self.breakers = [CircuitBreaker(breaker_failures, breaker_pause, logger, name=f"Worker {worker_id}")
+                         for worker_id in range(self.concurrency)]
+
+    async def produce(self, queue: asyncio.Queue, companies):
+        """Feed companies into the bounded queue, then one stop marker per worker"""
+        for company in companies:
+            await queue.put(company)
+        for _ in range(self.concurrency):
+            await queue.put(None)
+
+    async def worker(self, worker_id: int, queue: asyncio.Queue):
+        stats = self.stats[worker_id]
+        breaker = self.breakers[worker_id]
+        while True:
+            if breaker.open:
+                stats.pauses += 1
+                await breaker.wait()
+            company = await queue.get()
+            try:
+                if company is None:
+                    return
+                stats.last_company = company.get("name")
+                session = await self.sessions.acquire()
+                started = time.perf_counter()
+                ok = False
+                try:
+                    page = await session.checkout_page(self.start_url, self.page_timeout)
+                    try:
+                        ok = await self.job(page, company, session)
+                    finally:
+                        session.checkin_page(page)
+                except Exception as e:
+                    self.logger.error(f"Worker {worker_id} failed on {stats.last_company} ({session.name}): {e}")
+                finally:
+                    stats.busy_seconds += time.perf_counter() - started
+                    await self.sessions.release(session, ok)
+                breaker.record(ok)
+                if ok:
+                    stats.done += 1
+                else:
+                    stats.failed += 1
+                    self.failures.append(company)
+            finally:
+                queue.task_done()
+
+    async def run(self, companies):
+        """Scrape every company and return the per-worker stats of this run"""
+        self.stats = [WorkerStats(worker_id) for worker_id in range(self.concurrency)]
+        self.failures = []
+        # keep the queue short so the producer never runs far ahead of the pages
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        producer = asyncio.create_task(self.produce(queue, companies))
+        workers = [asyncio.create_task(self.worker(worker_id, queue)) for worker_id in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            producer.cancel()
+
+        for stats in self.stats:
+            self.logger.info(f"Worker stats {stats.as_dict()}")
+        return self.stats